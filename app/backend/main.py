@@ -1,11 +1,25 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import os
+import pathlib
 import sys
 
-# Add src to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+# Project root on sys.path, inserted once and only if missing - the routes and
+# services below rely on main.py having done this, so they don't each append a
+# duplicate entry that every later import would have to scan past
+_PROJECT_ROOT = str(pathlib.Path(__file__).resolve().parents[2])
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+# Use the libuv event loop where available - faster syscall path for the SSE
+# fan-outs and queue traffic (uvloop has no Windows build, so keep it optional)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 from app.backend.routes import api_router
 from app.backend.services.scheduler import get_portfolio_scheduler
@@ -37,7 +51,8 @@ app = FastAPI(
     title="AI Hedge Fund API", 
     description="Backend API for AI Hedge Fund with Portfolio Monitoring", 
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
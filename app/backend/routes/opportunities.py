@@ -2,27 +2,224 @@
 """
 Opportunities API Routes: Expose AI stock screening and opportunity discovery.
 """
+import array
 import asyncio
+import bisect
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
+from pathlib import Path
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Request, Response
 from fastapi.responses import StreamingResponse
 import json
 from loguru import logger
 
 from src.agents.stock_screener import (
-    get_stock_screener, 
-    StockOpportunity, 
+    get_stock_screener,
+    StockOpportunity,
     ScreenerSignal,
     AIStockScreener
 )
 
 router = APIRouter(prefix="/opportunities", tags=["opportunities"])
 
-# Global cache for opportunities
-_opportunities_cache: List[StockOpportunity] = []
-_last_scan_time: Optional[datetime] = None
-_scan_in_progress = False
+# Built once at import; resolving a signal query param is a dict hit instead of
+# raising/catching ValueError inside the enum constructor on every request
+_SIGNAL_LOOKUP = {signal.value: signal for signal in ScreenerSignal}
+
+@dataclass
+class OpportunityIndex:
+    """Pre-computed indexes over a scan result so request handlers never re-scan the cache.
+
+    Built once per background scan; all lookups (signal, sector, min_score, top-N)
+    become index slices instead of per-request list comprehensions.
+    """
+    by_score: List[StockOpportunity] = field(default_factory=list)  # sorted by overall_score desc
+    by_signal: Dict[ScreenerSignal, List[int]] = field(default_factory=dict)  # positions into by_score
+    by_sector: Dict[str, List[int]] = field(default_factory=dict)  # sector.lower() -> positions
+    score_array: array.array = field(default_factory=lambda: array.array('d'))  # negated scores, ascending, for bisect
+    signal_counts: Counter = field(default_factory=Counter)
+
+    @classmethod
+    def build(cls, opportunities: List[StockOpportunity]) -> "OpportunityIndex":
+        """Build all secondary indexes in a single pass over the score-sorted list"""
+        by_score = sorted(opportunities, key=lambda opp: opp.overall_score, reverse=True)
+        by_signal: Dict[ScreenerSignal, List[int]] = {}
+        by_sector: Dict[str, List[int]] = {}
+        signal_counts: Counter = Counter()
+        score_array = array.array('d')
+
+        for i, opp in enumerate(by_score):
+            by_signal.setdefault(opp.signal, []).append(i)
+            by_sector.setdefault(opp.sector.lower(), []).append(i)
+            signal_counts[opp.signal] += 1
+            score_array.append(-opp.overall_score)  # negated so the array is ascending
+
+        return cls(
+            by_score=by_score,
+            by_signal=by_signal,
+            by_sector=by_sector,
+            score_array=score_array,
+            signal_counts=signal_counts
+        )
+
+    def min_score_cutoff(self, min_score: float) -> int:
+        """Number of leading positions in by_score with overall_score >= min_score"""
+        return bisect.bisect_right(self.score_array, -min_score)
+
+    def sector_positions(self, sector: str) -> set:
+        """Positions whose sector contains the given substring (case-insensitive)"""
+        needle = sector.lower()
+        positions = set()
+        for sector_key, sector_indices in self.by_sector.items():
+            if needle in sector_key:
+                positions.update(sector_indices)
+        return positions
+
+@dataclass(frozen=True, slots=True)
+class OpportunitySnapshot:
+    """Immutable view of one scan result, published as a whole.
+
+    Handlers grab the module-level reference once and read every field off
+    that local, so a concurrent scan can never show them torn state. Writers
+    build a fresh snapshot and rebind the module attribute in a single step.
+    """
+    opportunities: tuple = ()
+    index: OpportunityIndex = field(default_factory=OpportunityIndex)
+    dict_list: tuple = ()  # opp.to_dict() per opportunity, in by_score order
+    top10_sse_frame: str = ""  # ready-to-send SSE frame for the top 10
+    last_scan: Optional[datetime] = None
+    scan_in_progress: bool = False
+
+# Current published snapshot; rebound atomically, never mutated in place
+_snapshot = OpportunitySnapshot()
+_scan_lock = asyncio.Lock()  # serializes writers (background scans, cache clears)
+_scan_state_lock = asyncio.Lock()  # guards the check-then-claim of scan_in_progress
+
+# SSE subscribers; each gets the prebuilt frame pushed when a scan publishes
+_opp_subscribers: set = set()
+
+# Constant keepalive frame - a liveness ping has a fixed shape, so build it once
+# instead of a dict + json.dumps per tick per subscriber
+_KEEPALIVE_FRAME = 'data: {"type": "keepalive"}\n\n'
+
+# Cross-worker sharing under `uvicorn --workers N`: module globals are
+# per-process, so without coordination every worker would run its own scan.
+# The published snapshot is mirrored to a JSON file under the repo's cache dir
+# (same scheme as the Zerodha caches) and the scan slot is claimed via an
+# exclusive-create lock file, so exactly one worker scans and the rest load.
+_SNAPSHOT_FILE = Path("cache") / "opportunities_snapshot.json"
+_SCAN_CLAIM_FILE = Path("cache") / "opportunities_scan.lock"
+_SCAN_CLAIM_TTL = 600  # seconds before a claim from a crashed worker is considered stale
+_snapshot_file_mtime = 0.0  # mtime of the snapshot file this worker last loaded
+
+def _build_snapshot(opportunities: List[StockOpportunity], last_scan: datetime) -> OpportunitySnapshot:
+    """Assemble the full immutable snapshot (index, payloads, SSE frame) for a scan result"""
+    # Serialization happens once here instead of per request/subscriber:
+    # every handler reuses dict_list, and /stream yields the frame verbatim
+    index = OpportunityIndex.build(opportunities)
+    dict_list = tuple(opp.to_dict() for opp in index.by_score)
+    stream_payload = {
+        "opportunities": list(dict_list[:10]),
+        "total_count": len(dict_list),
+        "last_scan": last_scan.isoformat(),
+        "scan_in_progress": False,
+        "timestamp": last_scan.isoformat()
+    }
+    return OpportunitySnapshot(
+        opportunities=tuple(index.by_score),
+        index=index,
+        dict_list=dict_list,
+        top10_sse_frame=f"data: {json.dumps(stream_payload)}\n\n",
+        last_scan=last_scan,
+        scan_in_progress=False
+    )
+
+def _publish_snapshot_file(snapshot: OpportunitySnapshot):
+    """Persist a published scan result so sibling uvicorn workers can load it"""
+    global _snapshot_file_mtime
+    try:
+        _SNAPSHOT_FILE.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "last_scan": snapshot.last_scan.isoformat(),
+            "opportunities": list(snapshot.dict_list)
+        }
+        tmp_file = _SNAPSHOT_FILE.with_suffix(".json.tmp")
+        tmp_file.write_text(json.dumps(payload))
+        os.replace(tmp_file, _SNAPSHOT_FILE)  # atomic - readers never see a partial file
+        _snapshot_file_mtime = _SNAPSHOT_FILE.stat().st_mtime
+    except OSError as e:
+        logger.warning(f"Could not persist opportunities snapshot: {e}")
+
+def _load_snapshot_file():
+    """Adopt a newer snapshot published by a sibling worker, if any.
+
+    Cheap mtime check on the happy path; the JSON is deserialized and indexed
+    only when the file actually changed since this worker last looked.
+    """
+    global _snapshot, _snapshot_file_mtime
+    try:
+        mtime = _SNAPSHOT_FILE.stat().st_mtime
+    except OSError:
+        return
+    if mtime <= _snapshot_file_mtime:
+        return
+    try:
+        payload = json.loads(_SNAPSHOT_FILE.read_text())
+        opportunities = [StockOpportunity.from_dict(d) for d in payload["opportunities"]]
+        last_scan = datetime.fromisoformat(payload["last_scan"])
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Could not load shared opportunities snapshot: {e}")
+        return
+    snapshot = _build_snapshot(opportunities, last_scan)
+    # Keep our own in-progress flag - the file only carries scan results
+    _snapshot = replace(snapshot, scan_in_progress=_snapshot.scan_in_progress)
+    _snapshot_file_mtime = mtime
+    logger.info(f"Adopted shared opportunities snapshot from sibling worker ({len(opportunities)} opportunities)")
+
+def _current_snapshot() -> OpportunitySnapshot:
+    """Current snapshot, picking up scans published by sibling workers"""
+    _load_snapshot_file()
+    return _snapshot
+
+def _claim_scan_slot() -> bool:
+    """Claim the cross-worker scan slot; False if a sibling holds a fresh claim"""
+    try:
+        _SCAN_CLAIM_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(_SCAN_CLAIM_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        os.close(fd)
+        return True
+    except FileExistsError:
+        try:
+            if time.time() - _SCAN_CLAIM_FILE.stat().st_mtime > _SCAN_CLAIM_TTL:
+                # Stale claim left by a crashed worker - take it over
+                _SCAN_CLAIM_FILE.touch()
+                return True
+        except OSError:
+            pass
+        return False
+    except OSError as e:
+        logger.warning(f"Could not claim scan slot: {e}")
+        return True  # fall back to per-worker scanning rather than never scanning
+
+def _release_scan_slot():
+    """Release the cross-worker scan slot"""
+    try:
+        _SCAN_CLAIM_FILE.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+def _notify_subscribers(frame: str):
+    """Push a frame to every subscriber queue without blocking the publisher"""
+    for queue in list(_opp_subscribers):
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Subscriber is not draining; it will catch up from _snapshot on its next read
+            logger.debug("Opportunities subscriber queue full, skipping frame")
 
 @router.get("/scan")
 async def scan_opportunities(
@@ -35,35 +232,54 @@ async def scan_opportunities(
     
     Returns immediately with scan status, actual scanning happens in background
     """
-    global _scan_in_progress, _last_scan_time
-    
+    global _snapshot
+
     try:
-        # Check if scan is already in progress
-        if _scan_in_progress:
-            return {
-                "status": "scan_in_progress",
-                "message": "Stock screening already in progress",
-                "last_scan": _last_scan_time.isoformat() if _last_scan_time else None
-            }
-        
-        # Check cache validity (5 minutes)
-        if not force_refresh and _last_scan_time:
-            time_since_scan = (datetime.now() - _last_scan_time).total_seconds()
-            if time_since_scan < 300:  # 5 minutes
+        # Check-and-claim atomically: without the lock two near-simultaneous
+        # requests both observe scan_in_progress=False and enqueue duplicate scans
+        async with _scan_state_lock:
+            snap = _current_snapshot()
+
+            # Check if scan is already in progress
+            if snap.scan_in_progress:
                 return {
-                    "status": "using_cache",
-                    "message": f"Using cached results from {time_since_scan:.0f} seconds ago",
-                    "opportunities_count": len(_opportunities_cache),
-                    "last_scan": _last_scan_time.isoformat()
+                    "status": "scan_in_progress",
+                    "message": "Stock screening already in progress",
+                    "last_scan": snap.last_scan.isoformat() if snap.last_scan else None
                 }
-        
+
+            # Check cache validity (5 minutes)
+            if not force_refresh and snap.last_scan:
+                time_since_scan = (datetime.now() - snap.last_scan).total_seconds()
+                if time_since_scan < 300:  # 5 minutes
+                    return {
+                        "status": "using_cache",
+                        "message": f"Using cached results from {time_since_scan:.0f} seconds ago",
+                        "opportunities_count": len(snap.opportunities),
+                        "last_scan": snap.last_scan.isoformat()
+                    }
+
+            # Only one worker across the uvicorn pool runs the scan; the rest
+            # pick up its result from the shared snapshot file
+            if not _claim_scan_slot():
+                return {
+                    "status": "scan_in_progress",
+                    "message": "Stock screening already in progress in another worker",
+                    "last_scan": snap.last_scan.isoformat() if snap.last_scan else None
+                }
+
+            # Claim the scan before releasing the lock
+            _snapshot = replace(_snapshot, scan_in_progress=True)
+
         # Start background scanning
         background_tasks.add_task(_background_scan, max_stocks)
         
+        # ~2s per stock, divided across the screener's concurrent workers
+        estimated_seconds = max(2, max_stocks * 2 // AIStockScreener.MAX_CONCURRENT_SCREENS)
         return {
             "status": "scan_started",
             "message": f"AI stock screening started for {max_stocks} stocks",
-            "estimated_time": f"{max_stocks * 2} seconds"
+            "estimated_time": f"{estimated_seconds} seconds"
         }
         
     except Exception as e:
@@ -72,24 +288,29 @@ async def scan_opportunities(
 
 async def _background_scan(max_stocks: int):
     """Background task to scan for opportunities"""
-    global _opportunities_cache, _last_scan_time, _scan_in_progress
-    
-    try:
-        _scan_in_progress = True
-        logger.info(f"Starting background opportunity scan for {max_stocks} stocks")
-        
-        screener = get_stock_screener()
-        opportunities = await screener.scan_opportunities(max_stocks=max_stocks)
-        
-        _opportunities_cache = opportunities
-        _last_scan_time = datetime.now()
-        
-        logger.info(f"Background scan completed: {len(opportunities)} opportunities found")
-        
-    except Exception as e:
-        logger.error(f"Background scan failed: {e}")
-    finally:
-        _scan_in_progress = False
+    global _snapshot
+
+    # scan_in_progress was already claimed atomically by the /scan handler
+    async with _scan_lock:
+        try:
+            logger.info(f"Starting background opportunity scan for {max_stocks} stocks")
+
+            screener = get_stock_screener()
+            opportunities = await screener.scan_opportunities(max_stocks=max_stocks)
+
+            # Build the index off to the side, then publish everything as one
+            # snapshot - locally, to sibling workers, and to SSE subscribers
+            _snapshot = _build_snapshot(opportunities, datetime.now())
+            _publish_snapshot_file(_snapshot)
+
+            _notify_subscribers(_snapshot.top10_sse_frame)
+            logger.info(f"Background scan completed: {len(opportunities)} opportunities found")
+
+        except Exception as e:
+            logger.error(f"Background scan failed: {e}")
+            _snapshot = replace(_snapshot, scan_in_progress=False)
+        finally:
+            _release_scan_slot()
 
 @router.get("/list")
 async def list_opportunities(
@@ -104,67 +325,59 @@ async def list_opportunities(
     try:
         logger.info(f"Listing opportunities with filters: signal={signal}, min_score={min_score}, sector={sector}, limit={limit}")
         
-        if not _opportunities_cache:
+        snap = _current_snapshot()
+        if not snap.opportunities:
             logger.warning("No opportunities in cache")
             return {
                 "opportunities": [],
                 "message": "No opportunities available. Run /scan first.",
                 "last_scan": None
             }
-        
-        # Apply filters
-        filtered_opportunities = _opportunities_cache[:]  # Create a copy
-        logger.info(f"Starting with {len(filtered_opportunities)} opportunities in cache")
-        
-        # Filter by signal (handle 'all' as special case)
+
+        index = snap.index
+        logger.info(f"Starting with {len(index.by_score)} opportunities in cache")
+
+        # Resolve the signal filter once (handle 'all' as special case)
+        signal_enum = None
         if signal and signal.lower() != 'all':
-            try:
-                signal_enum = ScreenerSignal(signal.upper())
-                filtered_opportunities = [
-                    opp for opp in filtered_opportunities 
-                    if opp.signal == signal_enum
-                ]
-                logger.info(f"After signal filter ({signal}): {len(filtered_opportunities)} opportunities")
-            except ValueError:
+            signal_enum = _SIGNAL_LOOKUP.get(signal.upper())
+            if signal_enum is None:
                 logger.error(f"Invalid signal value: {signal}")
                 raise HTTPException(status_code=400, detail=f"Invalid signal: {signal}. Valid values: all, STRONG_BUY, BUY, HOLD, SELL, STRONG_SELL")
-        
-        # Filter by minimum score
-        filtered_opportunities = [
-            opp for opp in filtered_opportunities 
-            if opp.overall_score >= min_score
-        ]
-        logger.info(f"After score filter (>={min_score}): {len(filtered_opportunities)} opportunities")
-        
-        # Filter by sector
+
+        # Score filter is a bisect on the pre-sorted scores: positions below the
+        # cutoff are exactly the opportunities with overall_score >= min_score
+        cutoff = index.min_score_cutoff(min_score)
+
+        # Signal filter intersects the pre-built per-signal position lists with the
+        # score prefix; without a signal filter the prefix itself is the candidate set
+        if signal_enum is not None:
+            candidates = [i for i in index.by_signal.get(signal_enum, []) if i < cutoff]
+            logger.info(f"After signal filter ({signal}) and score filter (>={min_score}): {len(candidates)} opportunities")
+        else:
+            candidates = range(cutoff)
+            logger.info(f"After score filter (>={min_score}): {cutoff} opportunities")
+
+        # Sector filter via set membership against the sector index
         if sector:
-            filtered_opportunities = [
-                opp for opp in filtered_opportunities 
-                if sector.lower() in opp.sector.lower()
-            ]
-            logger.info(f"After sector filter ({sector}): {len(filtered_opportunities)} opportunities")
-        
-        # Apply limit
-        filtered_opportunities = filtered_opportunities[:limit]
-        logger.info(f"After limit ({limit}): {len(filtered_opportunities)} opportunities")
-        
-        # Convert to dict format
-        opportunities_dict = []
-        for opp in filtered_opportunities:
-            try:
-                opp_dict = opp.to_dict()
-                opportunities_dict.append(opp_dict)
-            except Exception as e:
-                logger.error(f"Error converting opportunity {opp.ticker} to dict: {e}")
-                continue
+            sector_positions = index.sector_positions(sector)
+            candidates = [i for i in candidates if i in sector_positions]
+            logger.info(f"After sector filter ({sector}): {len(candidates)} opportunities")
+
+        # Apply limit (candidates are already in score order)
+        filtered_positions = list(candidates)[:limit]
+        logger.info(f"After limit ({limit}): {len(filtered_positions)} opportunities")
         
+        # Payloads were serialized once at scan time
+        opportunities_dict = [snap.dict_list[i] for i in filtered_positions]
+
         logger.info(f"Successfully returning {len(opportunities_dict)} opportunities")
         
         return {
             "opportunities": opportunities_dict,
             "total_found": len(opportunities_dict),
-            "total_scanned": len(_opportunities_cache),
-            "last_scan": _last_scan_time.isoformat() if _last_scan_time else None,
+            "total_scanned": len(snap.opportunities),
+            "last_scan": snap.last_scan.isoformat() if snap.last_scan else None,
             "filters_applied": {
                 "signal": signal,
                 "min_score": min_score,
@@ -181,25 +394,36 @@ async def list_opportunities(
 
 @router.get("/top")
 async def get_top_opportunities(
+    request: Request,
+    response: Response,
     count: int = Query(default=5, ge=1, le=20, description="Number of top opportunities")
 ):
     """
     Get top opportunities by overall score
     """
     try:
-        if not _opportunities_cache:
+        snap = _current_snapshot()
+        if not snap.opportunities:
             return {
                 "top_opportunities": [],
                 "message": "No opportunities available. Run /scan first."
             }
-        
-        # Get top opportunities (already sorted by score)
-        top_opportunities = _opportunities_cache[:count]
-        
+
+        # ETag from the scan timestamp: pollers skip the payload until a new scan
+        etag = f'W/"{int(snap.last_scan.timestamp() * 1000)}"' if snap.last_scan else None
+        if etag:
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "max-age=15"
+
+        # Slice the pre-serialized payloads directly
+        top_opportunities = list(snap.dict_list[:count])
+
         return {
-            "top_opportunities": [opp.to_dict() for opp in top_opportunities],
+            "top_opportunities": top_opportunities,
             "count": len(top_opportunities),
-            "last_scan": _last_scan_time.isoformat() if _last_scan_time else None
+            "last_scan": snap.last_scan.isoformat() if snap.last_scan else None
         }
         
     except Exception as e:
@@ -234,13 +458,14 @@ async def get_scan_status():
     """
     Get current scanning status and cache info
     """
+    snap = _current_snapshot()
     return {
-        "scan_in_progress": _scan_in_progress,
-        "opportunities_cached": len(_opportunities_cache),
-        "last_scan": _last_scan_time.isoformat() if _last_scan_time else None,
+        "scan_in_progress": snap.scan_in_progress,
+        "opportunities_cached": len(snap.opportunities),
+        "last_scan": snap.last_scan.isoformat() if snap.last_scan else None,
         "cache_age_seconds": (
-            (datetime.now() - _last_scan_time).total_seconds() 
-            if _last_scan_time else None
+            (datetime.now() - snap.last_scan).total_seconds()
+            if snap.last_scan else None
         )
     }
 
@@ -250,20 +475,17 @@ async def get_signal_distribution():
     Get distribution of signals across all opportunities
     """
     try:
-        if not _opportunities_cache:
+        snap = _current_snapshot()
+        if not snap.opportunities:
             return {"message": "No opportunities available"}
-        
-        signal_counts = {}
-        for signal in ScreenerSignal:
-            signal_counts[signal.value] = len([
-                opp for opp in _opportunities_cache 
-                if opp.signal == signal
-            ])
-        
+
+        # Counts were tallied once at scan time
+        signal_counts = {signal.value: snap.index.signal_counts.get(signal, 0) for signal in ScreenerSignal}
+
         return {
             "signal_distribution": signal_counts,
-            "total_opportunities": len(_opportunities_cache),
-            "last_scan": _last_scan_time.isoformat() if _last_scan_time else None
+            "total_opportunities": len(snap.opportunities),
+            "last_scan": snap.last_scan.isoformat() if snap.last_scan else None
         }
         
     except Exception as e:
@@ -276,25 +498,30 @@ async def stream_opportunities():
     Stream opportunities as Server-Sent Events
     """
     async def event_generator():
-        while True:
-            try:
-                # Send current opportunities
-                if _opportunities_cache:
-                    data = {
-                        "opportunities": [opp.to_dict() for opp in _opportunities_cache[:10]],
-                        "total_count": len(_opportunities_cache),
-                        "last_scan": _last_scan_time.isoformat() if _last_scan_time else None,
-                        "scan_in_progress": _scan_in_progress,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    yield f"data: {json.dumps(data)}\n\n"
-                
-                await asyncio.sleep(10)  # Update every 10 seconds
-                
-            except Exception as e:
-                logger.error(f"Error in opportunities stream: {e}")
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
-                await asyncio.sleep(5)
+        # Frames arrive via the subscriber queue only when a scan actually
+        # publishes, so idle streams cost nothing but a 30s keepalive
+        queue = asyncio.Queue(maxsize=2)
+        _opp_subscribers.add(queue)
+        try:
+            # Send the currently cached frame once on connect
+            snap = _current_snapshot()
+            if snap.top10_sse_frame:
+                yield snap.top10_sse_frame
+
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=30.0)
+                    yield frame
+                except asyncio.TimeoutError:
+                    # Keepalive so intermediaries don't drop the connection
+                    yield _KEEPALIVE_FRAME
+        except asyncio.CancelledError:
+            logger.info("Opportunities stream cancelled")
+        except Exception as e:
+            logger.error(f"Error in opportunities stream: {e}")
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+        finally:
+            _opp_subscribers.discard(queue)
     
     return StreamingResponse(
         event_generator(),
@@ -311,11 +538,16 @@ async def clear_cache():
     """
     Clear the opportunities cache
     """
-    global _opportunities_cache, _last_scan_time
-    
-    _opportunities_cache.clear()
-    _last_scan_time = None
-    
+    global _snapshot, _snapshot_file_mtime
+
+    async with _scan_lock:
+        _snapshot = OpportunitySnapshot()
+        try:
+            _SNAPSHOT_FILE.unlink(missing_ok=True)
+        except OSError:
+            pass
+        _snapshot_file_mtime = 0.0
+
     logger.info("Opportunities cache cleared manually")
     
     return {
@@ -3,69 +3,114 @@
 Portfolio API routes for real-time portfolio monitoring and management.
 Provides endpoints for portfolio data, streaming updates, and portfolio analytics.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from typing import Dict, Optional
 import asyncio
-import os
-import sys
 from datetime import datetime
-
-# Add src to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from loguru import logger
 
 from app.backend.services.scheduler import (
-    get_portfolio_scheduler, 
-    portfolio_sse_generator
+    build_portfolio_analytics,
+    get_portfolio_scheduler,
+    get_portfolio_response_cache,
+    portfolio_sse_generator,
+    run_kite_call
 )
 from src.tools.zerodha_portfolio import get_portfolio_monitor
 
 router = APIRouter(prefix="/portfolio")
 
+def _check_etag(request: Request, response: Response) -> Optional[Response]:
+    """ETag handling for the polled portfolio GET endpoints.
+
+    The ETag is the scheduler's snapshot version, so pollers whose data hasn't
+    changed since their last request get an empty 304 instead of a full payload.
+    Returns the 304 response to send, or None (with ETag headers set) to proceed.
+    """
+    etag = f'W/"{get_portfolio_scheduler().version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "max-age=15"
+    return None
+
 @router.get("/summary")
-async def get_portfolio_summary() -> Dict:
+async def get_portfolio_summary(request: Request, response: Response) -> Dict:
     """
     Get current portfolio summary including cash, positions, and PnL
     """
     try:
+        not_modified = _check_etag(request, response)
+        if not_modified is not None:
+            return not_modified
+
+        cache = get_portfolio_response_cache()
+        cached = cache.get("summary")
+        if cached is not None:
+            return cached
+
         scheduler = get_portfolio_scheduler()
         summary = await scheduler.get_portfolio_summary()
+        cache.set("summary", summary)
         return summary
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get portfolio summary: {str(e)}")
 
 @router.get("/positions")
-async def get_positions():
+async def get_positions(request: Request, response: Response):
     """
     Get current trading positions
     """
     try:
+        not_modified = _check_etag(request, response)
+        if not_modified is not None:
+            return not_modified
+
+        cache = get_portfolio_response_cache()
+        cached = cache.get("positions")
+        if cached is not None:
+            return cached
+
         portfolio_monitor = get_portfolio_monitor()
-        positions = portfolio_monitor.get_positions()
-        
-        return {
+        positions = await run_kite_call(portfolio_monitor.get_positions)
+
+        response = {
             "positions": positions,
             "count": len(positions),
             "timestamp": datetime.now().isoformat()
         }
+        cache.set("positions", response)
+        return response
     except Exception as e:
         logger.error(f"Failed to get positions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/cash")
-async def get_cash_balance() -> Dict:
+async def get_cash_balance(request: Request, response: Response) -> Dict:
     """
     Get current cash balance
     """
     try:
+        not_modified = _check_etag(request, response)
+        if not_modified is not None:
+            return not_modified
+
+        cache = get_portfolio_response_cache()
+        cached = cache.get("cash")
+        if cached is not None:
+            return cached
+
         portfolio_monitor = get_portfolio_monitor()
-        cash = portfolio_monitor.get_cash()
-        
-        return {
+        cash = await run_kite_call(portfolio_monitor.get_cash)
+
+        response = {
             "cash": cash,
             "currency": "INR",
             "timestamp": portfolio_monitor._last_fetch_time.isoformat() if portfolio_monitor._last_fetch_time else None
         }
+        cache.set("cash", response)
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get cash balance: {str(e)}")
 
@@ -99,12 +144,17 @@ async def refresh_portfolio() -> Dict:
     Force refresh portfolio data
     """
     try:
-        portfolio_monitor = get_portfolio_monitor()
-        snapshot = portfolio_monitor.get_portfolio_snapshot(force_refresh=True)
-        
+        # Coalesces with any refresh already in flight (scheduler tick or
+        # another /refresh call) instead of issuing a second Kite round trip
+        scheduler = get_portfolio_scheduler()
+        snapshot = await scheduler.refresh_snapshot()
+
         if not snapshot:
             raise HTTPException(status_code=500, detail="Failed to refresh portfolio data")
-        
+
+        # Cached responses are stale now that the snapshot was force-refreshed
+        get_portfolio_response_cache().clear()
+
         return {
             "message": "Portfolio refreshed successfully",
             "timestamp": snapshot.timestamp.isoformat(),
@@ -119,61 +169,35 @@ async def refresh_portfolio() -> Dict:
         raise HTTPException(status_code=500, detail=f"Failed to refresh portfolio: {str(e)}")
 
 @router.get("/analytics")
-async def get_portfolio_analytics() -> Dict:
+async def get_portfolio_analytics(request: Request, response: Response) -> Dict:
     """
     Get portfolio analytics and metrics
     """
     try:
+        not_modified = _check_etag(request, response)
+        if not_modified is not None:
+            return not_modified
+
+        # Prefer the analytics computed by the scheduler on its last refresh
+        scheduler = get_portfolio_scheduler()
+        if scheduler.last_analytics is not None:
+            return scheduler.last_analytics
+
+        # Scheduler hasn't published yet (e.g. just started) - compute once here
+        cache = get_portfolio_response_cache()
+        cached = cache.get("analytics")
+        if cached is not None:
+            return cached
+
         portfolio_monitor = get_portfolio_monitor()
-        snapshot = portfolio_monitor.get_portfolio_snapshot()
-        
+        snapshot = await run_kite_call(portfolio_monitor.get_portfolio_snapshot)
+
         if not snapshot:
             raise HTTPException(status_code=500, detail="Failed to fetch portfolio data")
-        
-        # Calculate analytics
-        total_value = snapshot.total_value
-        cash_percentage = (snapshot.cash / total_value * 100) if total_value > 0 else 100
-        invested_percentage = 100 - cash_percentage
-        
-        # Position analytics
-        position_count = len(snapshot.positions)
-        avg_position_size = (snapshot.invested_value / position_count) if position_count > 0 else 0
-        
-        # Top positions by weight
-        top_positions = sorted(snapshot.positions, key=lambda x: abs(x.weight), reverse=True)[:5]
-        
-        # Sector concentration (simplified - would need sector mapping)
-        largest_position_weight = top_positions[0].weight if top_positions else 0
-        
-        # PnL analytics
-        total_return_pct = (snapshot.total_pnl / (total_value - snapshot.total_pnl) * 100) if (total_value - snapshot.total_pnl) > 0 else 0
-        
-        return {
-            "timestamp": snapshot.timestamp.isoformat(),
-            "portfolio_metrics": {
-                "total_value": total_value,
-                "cash_percentage": cash_percentage,
-                "invested_percentage": invested_percentage,
-                "position_count": position_count,
-                "avg_position_size": avg_position_size,
-                "largest_position_weight": largest_position_weight,
-                "total_return_percentage": total_return_pct
-            },
-            "top_positions": [
-                {
-                    "ticker": pos.ticker,
-                    "weight": pos.weight,
-                    "pnl": pos.pnl,
-                    "market_value": pos.market_value
-                }
-                for pos in top_positions
-            ],
-            "risk_metrics": {
-                "cash_buffer": cash_percentage,
-                "concentration_risk": largest_position_weight,
-                "diversification_score": min(100, position_count * 10)  # Simple score
-            }
-        }
+
+        response = build_portfolio_analytics(snapshot)
+        cache.set("analytics", response)
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -196,7 +220,7 @@ async def portfolio_health_check() -> Dict:
         
         # Test portfolio data fetch
         try:
-            cash = portfolio_monitor.get_cash()
+            cash = await run_kite_call(portfolio_monitor.get_cash)
             data_accessible = True
         except:
             data_accessible = False
@@ -225,7 +249,7 @@ async def get_holdings():
     """
     try:
         portfolio_monitor = get_portfolio_monitor()
-        holdings = portfolio_monitor.get_holdings()
+        holdings = await run_kite_call(portfolio_monitor.get_holdings)
         
         return {
             "holdings": holdings,
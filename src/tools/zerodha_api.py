@@ -1,11 +1,14 @@
 import os
+import functools
+import numpy as np
 import pandas as pd
 import datetime
 from pathlib import Path
 from loguru import logger
 from typing import Optional, List, Dict, Any
-import random
 import requests
+from urllib3.util.retry import Retry
+import zlib
 from bs4 import BeautifulSoup
 import re
 import math
@@ -35,6 +38,11 @@ CACHE_DIR = Path("cache")
 HISTORICAL_CACHE_DIR = CACHE_DIR / "historical"
 FUNDAMENTALS_CACHE_DIR = CACHE_DIR / "fundamentals"
 
+# Fundamentals refresh at most a few times a day on screener.in, so cached
+# scrapes stay valid for 6 hours; stale files are still used as a fallback
+# when a refetch fails
+FUNDAMENTALS_CACHE_TTL = 6 * 3600
+
 # Ensure cache directories exist
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 HISTORICAL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -44,6 +52,16 @@ FUNDAMENTALS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 _screener_lock = Lock()
 _last_screener_request = 0.0
 
+# Shared session so successive scrapes reuse one TLS connection instead of
+# paying a full handshake per ticker; transient server errors and 429s are
+# retried with backoff at the transport layer
+_screener_session = requests.Session()
+_screener_session.mount('https://', requests.adapters.HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+
 def _rate_limited_get(url, headers, timeout):
     """Perform a GET with at least 1s between successive calls."""
     global _last_screener_request
@@ -52,7 +70,7 @@ def _rate_limited_get(url, headers, timeout):
         wait = 1.0 - (now - _last_screener_request)
         if wait > 0:
             time.sleep(wait)
-        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp = _screener_session.get(url, headers=headers, timeout=timeout)
         _last_screener_request = time.time()
         return resp
 
@@ -319,14 +337,17 @@ class ZerodhaAdapter:
         cache_suffix = "consolidated" if consolidated else "standalone"
         cache_file = FUNDAMENTALS_CACHE_DIR / f"{ticker}_fundamentals_{cache_suffix}.json"
         
-        # Check cache first
+        # Check cache first; entries older than the TTL fall through to a
+        # refetch so a rerun later in the day picks up refreshed numbers
         if cache_file.exists():
             try:
-                logger.info(f"Loading fundamentals for {ticker} from cache: {cache_file}")
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"CACHED FUNDAMENTALS: {ticker} has {len(data)} data points including {', '.join(list(data.keys())[:5])}...")
-                    return data
+                if time.time() - cache_file.stat().st_mtime < FUNDAMENTALS_CACHE_TTL:
+                    logger.info(f"Loading fundamentals for {ticker} from cache: {cache_file}")
+                    with open(cache_file, 'r') as f:
+                        data = json.load(f)
+                        logger.info(f"CACHED FUNDAMENTALS: {ticker} has {len(data)} data points including {', '.join(list(data.keys())[:5])}...")
+                        return data
+                logger.info(f"Fundamentals cache for {ticker} is older than {FUNDAMENTALS_CACHE_TTL}s, refetching")
             except Exception as e:
                 logger.error(f"Error reading fundamentals cache file {cache_file}: {e}. Will fetch fresh data.")
         
@@ -602,10 +623,29 @@ class ZerodhaAdapter:
 
         except requests.exceptions.Timeout:
             logger.error(f"Timeout fetching data for {ticker} from screener.in at {url_tried}")
-            return {"error": "Timeout", "ticker": ticker, "url_tried": url_tried}
+            stale = self._load_stale_fundamentals(ticker, cache_file)
+            return stale if stale is not None else {"error": "Timeout", "ticker": ticker, "url_tried": url_tried}
         except Exception as e:
             logger.error(f"General error in get_fundamentals for {ticker} at url {url_tried}: {e}", exc_info=True)
-            return {"error": str(e), "ticker": ticker, "url_tried": url_tried}
+            stale = self._load_stale_fundamentals(ticker, cache_file)
+            return stale if stale is not None else {"error": str(e), "ticker": ticker, "url_tried": url_tried}
+
+    @staticmethod
+    def _load_stale_fundamentals(ticker: str, cache_file: Path) -> dict | None:
+        """Load an expired fundamentals cache entry as a last resort.
+
+        A refetch can fail after the TTL check already rejected the cached
+        copy; stale numbers beat no numbers for screening, so reuse them.
+        """
+        if not cache_file.exists():
+            return None
+        try:
+            logger.info(f"Using stale fundamentals cache for {ticker} after fetch failure: {cache_file}")
+            with open(cache_file, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading stale fundamentals cache file {cache_file}: {e}")
+            return None
 
 # Adapter for the financialdatasets.ai API interface
 zerodha_adapter = ZerodhaAdapter.get_instance()
@@ -633,10 +673,54 @@ def get_prices(ticker: str, start_date: str, end_date: str) -> List[Price]:
     
     return prices
 
+# (field, base, spread) for the metrics screener.in does not provide: the
+# placeholder is uniform in base +/- spread/2, same ranges as before
+_PLACEHOLDER_METRIC_SPREADS = (
+    ("beta", 1.0, 0.5),
+    ("dividend_yield", 0.02, 0.01),
+    ("free_cash_flow_yield", 0.05, 0.02),
+    ("gross_margin", 0.3, 0.1),
+    ("operating_margin", 0.18, 0.04),
+    ("net_margin", 0.12, 0.03),
+    ("return_on_equity", 0.15, 0.05),
+    ("return_on_assets", 0.08, 0.02),
+    ("return_on_invested_capital", 0.12, 0.04),
+    ("asset_turnover", 0.7, 0.2),
+    ("inventory_turnover", 6.0, 1.0),
+    ("receivables_turnover", 5.0, 1.0),
+    ("days_sales_outstanding", 45.0, 5.0),
+    ("operating_cycle", 65.0, 10.0),
+    ("working_capital_turnover", 4.0, 1.0),
+    ("current_ratio", 1.5, 0.5),
+    ("quick_ratio", 1.2, 0.4),
+    ("cash_ratio", 0.5, 0.2),
+    ("operating_cash_flow_ratio", 1.3, 0.4),
+    ("debt_to_equity", 0.7, 0.2),
+    ("debt_to_assets", 0.35, 0.1),
+    ("interest_coverage", 5.0, 2.0),
+    ("payout_ratio", 0.25, 0.1),
+    ("earnings_per_share", 50.0, 10.0),
+    ("book_value_per_share", 300.0, 50.0),
+    ("free_cash_flow_per_share", 40.0, 8.0),
+)
+
+@functools.lru_cache(maxsize=1024)
+def _placeholder_metric_defaults(ticker: str) -> dict:
+    """Deterministic placeholder values for metrics screener.in lacks.
+
+    The old code drew random.random() per field on every call, so two scans
+    of the same stock saw different fundamentals. One vectorized draw from a
+    ticker-seeded generator keeps the same plausible spread, is stable across
+    scans, and is memoized so repeat lookups cost a dict hit.
+    """
+    draws = np.random.default_rng(zlib.crc32(ticker.encode())).uniform(-0.5, 0.5, len(_PLACEHOLDER_METRIC_SPREADS))
+    return {name: base + draw * spread for (name, base, spread), draw in zip(_PLACEHOLDER_METRIC_SPREADS, draws)}
+
 def get_financial_metrics(ticker: str, end_date: str, period: str = "ttm", limit: int = 10) -> List[FinancialMetrics]:
     """Fetch financial metrics and convert to financialdatasets.ai format."""
     # Get fundamentals from Zerodha adapter
     fundamentals = zerodha_adapter.get_fundamentals(ticker)
+    placeholders = _placeholder_metric_defaults(ticker)
     
     if not fundamentals:
         return []
@@ -659,8 +743,8 @@ def get_financial_metrics(ticker: str, end_date: str, period: str = "ttm", limit
         net_income = fundamentals.get('net_profit', revenue * 0.1)
         
         # Add some reasonable financial metrics for Indian companies
-        beta = fundamentals.get('beta', 1.0 + (random.random() * 0.5 - 0.25))
-        dividend_yield = fundamentals.get('dividend_yield', 0.02 + (random.random() * 0.01 - 0.005))
+        beta = fundamentals.get('beta', placeholders['beta'])
+        dividend_yield = fundamentals.get('dividend_yield', placeholders['dividend_yield'])
         
         # Create the metrics object with all required fields
         metric = FinancialMetrics(
@@ -675,27 +759,27 @@ def get_financial_metrics(ticker: str, end_date: str, period: str = "ttm", limit
             price_to_sales_ratio=market_cap / revenue if market_cap and revenue else None,
             enterprise_value_to_ebitda_ratio=market_cap * 1.2 / ebitda if market_cap and ebitda else None,
             enterprise_value_to_revenue_ratio=market_cap * 1.2 / revenue if market_cap and revenue else None,
-            free_cash_flow_yield=0.05 + (random.random() * 0.02 - 0.01),
+            free_cash_flow_yield=placeholders['free_cash_flow_yield'],
             peg_ratio=pe_ratio / 0.15 if pe_ratio else None,
-            gross_margin=0.3 + (random.random() * 0.1 - 0.05),
-            operating_margin=fundamentals.get('operating_margin', 0.18 + (random.random() * 0.04 - 0.02)),
-            net_margin=fundamentals.get('net_margin', 0.12 + (random.random() * 0.03 - 0.015)),
-            return_on_equity=fundamentals.get('roe', 0.15 + (random.random() * 0.05 - 0.025)),
-            return_on_assets=fundamentals.get('roa', 0.08 + (random.random() * 0.02 - 0.01)),
-            return_on_invested_capital=fundamentals.get('roic', 0.12 + (random.random() * 0.04 - 0.02)),
-            asset_turnover=0.7 + (random.random() * 0.2 - 0.1),
-            inventory_turnover=6.0 + (random.random() * 1.0 - 0.5),
-            receivables_turnover=5.0 + (random.random() * 1.0 - 0.5),
-            days_sales_outstanding=45.0 + (random.random() * 5.0 - 2.5),
-            operating_cycle=65.0 + (random.random() * 10.0 - 5.0),
-            working_capital_turnover=4.0 + (random.random() * 1.0 - 0.5),
-            current_ratio=1.5 + (random.random() * 0.5 - 0.25),
-            quick_ratio=1.2 + (random.random() * 0.4 - 0.2),
-            cash_ratio=0.5 + (random.random() * 0.2 - 0.1),
-            operating_cash_flow_ratio=1.3 + (random.random() * 0.4 - 0.2),
-            debt_to_equity=fundamentals.get('debt_to_equity', 0.7 + (random.random() * 0.2 - 0.1)),
-            debt_to_assets=0.35 + (random.random() * 0.1 - 0.05),
-            interest_coverage=5.0 + (random.random() * 2.0 - 1.0),
+            gross_margin=placeholders['gross_margin'],
+            operating_margin=fundamentals.get('operating_margin', placeholders['operating_margin']),
+            net_margin=fundamentals.get('net_margin', placeholders['net_margin']),
+            return_on_equity=fundamentals.get('roe', placeholders['return_on_equity']),
+            return_on_assets=fundamentals.get('roa', placeholders['return_on_assets']),
+            return_on_invested_capital=fundamentals.get('roic', placeholders['return_on_invested_capital']),
+            asset_turnover=placeholders['asset_turnover'],
+            inventory_turnover=placeholders['inventory_turnover'],
+            receivables_turnover=placeholders['receivables_turnover'],
+            days_sales_outstanding=placeholders['days_sales_outstanding'],
+            operating_cycle=placeholders['operating_cycle'],
+            working_capital_turnover=placeholders['working_capital_turnover'],
+            current_ratio=placeholders['current_ratio'],
+            quick_ratio=placeholders['quick_ratio'],
+            cash_ratio=placeholders['cash_ratio'],
+            operating_cash_flow_ratio=placeholders['operating_cash_flow_ratio'],
+            debt_to_equity=fundamentals.get('debt_to_equity', placeholders['debt_to_equity']),
+            debt_to_assets=placeholders['debt_to_assets'],
+            interest_coverage=placeholders['interest_coverage'],
             revenue_growth=0.08 - i * 0.01, # 8% growth decreasing by 1% each year back
             earnings_growth=0.10 - i * 0.015, # 10% growth decreasing by 1.5% each year back
             book_value_growth=0.07 - i * 0.01, # 7% growth decreasing by 1% each year back
@@ -703,10 +787,10 @@ def get_financial_metrics(ticker: str, end_date: str, period: str = "ttm", limit
             free_cash_flow_growth=0.08 - i * 0.012, # 8% growth decreasing by 1.2% each year back
             operating_income_growth=0.09 - i * 0.014, # 9% growth decreasing by 1.4% each year back
             ebitda_growth=0.08 - i * 0.013, # 8% growth decreasing by 1.3% each year back
-            payout_ratio=0.25 + (random.random() * 0.1 - 0.05),
-            earnings_per_share=net_income / (market_cap / fundamentals.get('price', 1000)) if net_income and market_cap else 50.0 + (random.random() * 10.0 - 5.0),
-            book_value_per_share=market_cap * 0.7 / (market_cap / fundamentals.get('price', 1000)) if market_cap else 300.0 + (random.random() * 50.0 - 25.0),
-            free_cash_flow_per_share=net_income * 0.8 / (market_cap / fundamentals.get('price', 1000)) if net_income and market_cap else 40.0 + (random.random() * 8.0 - 4.0),
+            payout_ratio=placeholders['payout_ratio'],
+            earnings_per_share=net_income / (market_cap / fundamentals.get('price', 1000)) if net_income and market_cap else placeholders['earnings_per_share'],
+            book_value_per_share=market_cap * 0.7 / (market_cap / fundamentals.get('price', 1000)) if market_cap else placeholders['book_value_per_share'],
+            free_cash_flow_per_share=net_income * 0.8 / (market_cap / fundamentals.get('price', 1000)) if net_income and market_cap else placeholders['free_cash_flow_per_share'],
             beta=beta,
             dividend_yield=dividend_yield,
             revenue=revenue,